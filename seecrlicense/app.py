@@ -20,8 +20,7 @@
 #
 ## end license ##
 
-from .applylicense import ApplyLicense, licenses
-from .sourcefile import markersByExtension, markersByFilename
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
 
 explain = """
 This applies a license to one or more files or directories.
@@ -50,26 +49,35 @@ Example:
         "cq2": {"name": "Seek You Too B.V. (CQ2)", "url": "http://www.cq2.nl",
              "text": "Some optional text"}
     }
-}""" % dict(
-    supportedTypes="; ".join(
-        ["*" + ext for ext in list(markersByExtension.keys())]
-        + list(markersByFilename.keys())
-    ),
-    supportedLicenses="; ".join(list(licenses.keys())),
-)
+}"""
 
 
-def main(args=None):
-    from argparse import ArgumentParser, RawDescriptionHelpFormatter
+class _ArgumentParser(ArgumentParser):
+    """Fills in the supported file types and licenses only when help is shown."""
+
+    def format_help(self):
+        from .applylicense import licenseFiles
+        from .sourcefile import markersByExtension, markersByFilename
+
+        self.epilog = explain % dict(
+            supportedTypes="; ".join(
+                ["*" + ext for ext in list(markersByExtension.keys())]
+                + list(markersByFilename.keys())
+            ),
+            supportedLicenses="; ".join(list(licenseFiles().keys())),
+        )
+        return ArgumentParser.format_help(self)
 
-    parser = ArgumentParser(epilog=explain, formatter_class=RawDescriptionHelpFormatter)
+
+def main(args=None):
+    parser = _ArgumentParser(formatter_class=RawDescriptionHelpFormatter)
     parser.add_argument(
         "configPath", metavar="<configFile>", help="path to config file."
     )
     parser.add_argument(
         "path",
         metavar="<file|directory>",
-        help="file or directory to which license needs to be applied.",
+        help="file or directory to which license needs to be applied, '-' to read file names from stdin.",
         nargs="+",
     )
     parser.add_argument(
@@ -84,7 +92,62 @@ def main(args=None):
         action="store_true",
         default=False,
         dest="changedOnly",
-        help="Only changed files",
+        help="Only files that are added, modified, renamed or untracked according to git",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        dest="since",
+        metavar="<ref>",
+        help="Only files changed in git since <ref> (i.e. <ref>...HEAD) or in the working tree. Implies --changed-only",
+    )
+    parser.add_argument(
+        "--git-files",
+        action="store_true",
+        default=False,
+        dest="gitFiles",
+        help="Take the files in directories from 'git ls-files' instead of walking them",
+    )
+    parser.add_argument(
+        "--include-untracked",
+        action="store_true",
+        default=False,
+        dest="includeUntracked",
+        help="With --git-files, also include untracked files that are not ignored",
+    )
+    parser.add_argument(
+        "--git-objects",
+        nargs="?",
+        const="",
+        default=None,
+        dest="gitObjects",
+        metavar="<rev>",
+        help="Work on git objects instead of the working tree: license the files in the index and stage the result, or with <rev> the files in that revision and commit the result on top of it without moving any ref. Can not be combined with --jobs, --io-threads, --monorepo, --cache, --changed-only or --since",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        dest="exclude",
+        metavar="<pattern>",
+        help="Skip files and directories matching this gitignore style pattern, on top of .licenseignore and the linguist-generated and linguist-vendored attributes in .gitattributes. Can be repeated",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        dest="include",
+        metavar="<pattern>",
+        help="Do examine files matching this gitignore style pattern, even when excluded otherwise, as long as no directory above them is excluded. Can be repeated",
+    )
+    parser.add_argument(
+        "--monorepo",
+        nargs="?",
+        const="license.conf",
+        default=None,
+        dest="nestedConfigs",
+        metavar="<configName>",
+        help="Also use config files named <configName> (default: license.conf) found in directories below the one of <configFile>. Each applies to its own directory tree and inherits what it does not set from the nearest config above it; copyrights given by key are combined",
     )
     parser.add_argument(
         "--dry-run",
@@ -93,6 +156,41 @@ def main(args=None):
         dest="dryRun",
         help="Show what would be changed",
     )
+    parser.add_argument(
+        "--write-strategy",
+        choices=["fast", "durable", "staged"],
+        default="fast",
+        dest="writeStrategy",
+        help="fast: rename each rewritten file into place; durable: also fsync each file and, once, every directory written to; staged: write all temporary files first and rename them in bulk at the end (default: fast)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["json"],
+        default=None,
+        dest="report",
+        help="Write a report with the outcome and timings of every file",
+    )
+    parser.add_argument(
+        "--report-file",
+        default=None,
+        dest="reportFile",
+        metavar="<reportFile>",
+        help="File to write the report to (default: seecr-license-report.json)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        default=False,
+        dest="check",
+        help="Only report files that need a license update, without changing them. Exits with 1 if there are any",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        default=False,
+        dest="failFast",
+        help="With --check, stop at the first file that needs a license update",
+    )
     parser.add_argument(
         "-y",
         "--year",
@@ -100,16 +198,114 @@ def main(args=None):
         dest="year",
         help="Use given year in license or current year if not set",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        dest="jobs",
+        help="Number of worker processes to examine files with, 0 for one per CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        dest="ioThreads",
+        help="Keep many files in flight on an asyncio loop using this many threads for file I/O, useful on network filesystems. Can not be combined with --jobs",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        dest="profile",
+        metavar="<dir>",
+        help="Profile the run with cProfile and write the stats to <dir>, one file per process plus merged.prof, and print the top functions",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        dest="cachePath",
+        metavar="<cacheFile>",
+        help="Remember files that already have an up to date license in this file and skip them on the next run",
+    )
+    parser.add_argument(
+        "--years-from-git",
+        action="store_true",
+        default=False,
+        dest="yearsFromGit",
+        help="Use the years of the commits that touched a file, also under the names it had before a rename, as its copyright years. Files without history get --year or the current year",
+    )
+    parser.add_argument(
+        "--watch",
+        nargs="?",
+        const="auto",
+        default=None,
+        choices=["auto", "inotify", "poll"],
+        dest="watch",
+        help="Keep running and apply the license to files as they change, using inotify where available or by polling",
+    )
+    parser.add_argument(
+        "--serve",
+        default=None,
+        dest="serve",
+        metavar="<socket>",
+        help="Keep running and answer check and apply requests on this Unix socket, see seecr-license-client. Paths on the command line are ignored",
+    )
     parser.add_argument(
         "--select",
         help='Select which copyright holders should be applied. Comma separated. ie: "seecr,cq2"',
     )
 
     args = parser.parse_args(args)
+    if args.ioThreads and args.jobs != 1:
+        parser.error("--io-threads can not be combined with --jobs")
+    if args.gitObjects is not None:
+        for option, given in [
+            ("--jobs", args.jobs != 1),
+            ("--io-threads", args.ioThreads),
+            ("--monorepo", args.nestedConfigs),
+            ("--cache", args.cachePath),
+            ("--changed-only", args.changedOnly),
+            ("--since", args.since),
+            ("--watch", args.watch),
+            ("--serve", args.serve),
+        ]:
+            if given:
+                parser.error("--git-objects can not be combined with %s" % option)
+
+    from .applylicense import ApplyLicense
 
     try:
-        applyLicense = ApplyLicense.fromFile(**vars(args))
-        applyLicense.run(args.path)
+        applyLicense = ApplyLicense.fromFile(
+            memoryCache=args.serve is not None, **vars(args)
+        )
+        if args.serve:
+            from .server import LicenseServer
+
+            try:
+                LicenseServer(args.serve, applyLicense).serve()
+            except KeyboardInterrupt:
+                pass
+            return 0
+        if args.gitObjects is not None:
+            from .gitobjects import runOnGitObjects
+
+            summary = runOnGitObjects(
+                applyLicense, args.path, rev=args.gitObjects or None
+            )
+        elif args.watch:
+            from .watch import Watcher
+
+            Watcher(applyLicense, args.path, engine=args.watch).run()
+            return 0
+        else:
+            summary = applyLicense.run(args.path)
     except IOError as e:
         print(e)
         parser.print_help()
+        return 2
+    except RuntimeError as e:
+        print(e)
+        return 2
+    if args.check and (summary["updated"] or summary["errors"]):
+        return 1
+    return 0
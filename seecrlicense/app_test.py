@@ -20,6 +20,12 @@
 #
 ## end license ##
 
+import pytest
+
+import io
+import sys
+import subprocess
+
 from .app import main
 
 
@@ -73,3 +79,100 @@ def someMethod():
     return False
 """
     )
+
+
+def test_check(tmp_path, capsys, monkeypatch):
+    conf_file = tmp_path / "license.conf"
+    conf_file.write_text(
+        '{"project": "P", "license": "arr",'
+        ' "copyrights": [{"name": "CQ2", "url": "http://cq2.nl"}]}'
+    )
+    src = tmp_path / "src"
+    src.mkdir()
+    for name in ["a.py", "b.py", "c.py"]:
+        (src / name).write_text("# stuff\n")
+
+    assert main(["--check", "-y", "2042", conf_file.as_posix(), src.as_posix()]) == 1
+    out = capsys.readouterr().out
+    assert "License needs updating in %s" % (src / "b.py") in out
+    assert "3 files need a license update." in out
+    assert (src / "a.py").read_text() == "# stuff\n"
+
+    args = ["--check", "--fail-fast", "-y", "2042", conf_file.as_posix()]
+    assert main(args + [src.as_posix()]) == 1
+    assert "1 files need a license update." in capsys.readouterr().out
+
+    assert main(["-y", "2042", conf_file.as_posix(), (src / "a.py").as_posix()]) == 0
+    monkeypatch.setattr(
+        "sys.stdin", io.StringIO("%s\n%s\n" % (src / "a.py", tmp_path / "gone.py"))
+    )
+    assert main(["--check", "-y", "2042", conf_file.as_posix(), "-"]) == 0
+    assert "0 files need a license update." in capsys.readouterr().out
+
+
+def test_startup_is_lazy():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, seecrlicense.app; print(sorted(m for m in "
+            "['seecrlicense.applylicense', 'concurrent.futures', 'importlib.resources', "
+            "'subprocess', 'hashlib'] if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert loaded.strip() == "[]"
+
+
+def test_help_lists_licenses(capsys):
+    try:
+        main(["--help"])
+    except SystemExit:
+        pass
+    out = capsys.readouterr().out
+    assert "Licenses available:" in out
+    assert "GPLv2" in out
+    assert "*.py" in out
+
+
+def test_io_threads_with_jobs_is_rejected(tmp_path, capsys):
+    conf_file = tmp_path / "license.conf"
+    conf_file.write_text('{"license": "arr", "copyrights": []}')
+    with pytest.raises(SystemExit) as e:
+        main(["-j", "2", "--io-threads", "2", conf_file.as_posix(), "."])
+    assert e.value.code == 2
+    assert "--io-threads can not be combined with --jobs" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "option", [["--jobs", "2"], ["--monorepo"], ["--cache", "c.json"], ["--since", "x"]]
+)
+def test_options_git_objects_can_not_be_combined_with(tmp_path, capsys, option):
+    conf_file = tmp_path / "license.conf"
+    conf_file.write_text('{"license": "arr", "copyrights": []}')
+    with pytest.raises(SystemExit) as e:
+        main([conf_file.as_posix(), ".", "--git-objects", *option])
+    assert e.value.code == 2
+    assert (
+        "--git-objects can not be combined with %s" % option[0]
+        in capsys.readouterr().err
+    )
+
+
+@pytest.mark.parametrize(
+    "option", [["--git-files"], ["--years-from-git"], ["--changed-only"]]
+)
+def test_git_failure_outside_checkout(tmp_path, capsys, monkeypatch, option):
+    conf_file = tmp_path / "license.conf"
+    conf_file.write_text(
+        '{"license": "arr", "copyrights": [{"name": "CQ2", "url": "http://cq2.nl"}]}'
+    )
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+    monkeypatch.chdir(tmp_path)
+
+    assert main([*option, conf_file.as_posix(), tmp_path.as_posix()]) == 2
+    out = capsys.readouterr().out
+    assert "'git " in out and "failed:" in out
+    assert "usage:" not in out
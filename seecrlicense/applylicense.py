@@ -20,89 +20,492 @@
 #
 ## end license ##
 
-from os import walk, listdir
-from os.path import isfile, isdir, join, basename
+from os import walk, listdir, cpu_count, sep
+from os.path import (
+    isfile,
+    isdir,
+    join,
+    basename,
+    dirname,
+    realpath,
+    commonpath,
+    relpath,
+)
+from copy import deepcopy
+from collections import deque
+from itertools import islice
 from .license import License
 from .sourcefile import SourceFile, UnrecognizedFileType
 from .copyrightset import CopyrightSet
 from time import strftime, localtime
-from .tools import git_status
+from .tools import git_changed_files, git_ls_files, git_history_years
+from .cache import LicenseCache, fileState, fingerprint
+from .report import (
+    FileResult,
+    RunReport,
+    UNCHANGED,
+    UPDATED,
+    INSERTED,
+    UNRECOGNIZED,
+    CACHED,
+    ERROR,
+)
+from .writer import WriteBatch, FAST, DURABLE, STAGED
+from .ignore import PathMatcher
+from .__version__ import VERSION
 
+import sys
 import json
-import pathlib
-import importlib.resources as resources
-
-license_path = resources.files("seecrlicense") / "license-data"
-
-licenses = {f.stem: f for f in license_path.glob("*.header")}
 
 IGNORED_DIRECTORIES = [".git", ".svn", "deps.d", "__pycache__"]
 
+DEFAULT_IGNORE_RULES = [name + "/" for name in IGNORED_DIRECTORIES] + [".*.swp"]
+
 currentYear = strftime("%Y", localtime())
 
+CHUNKSIZE = 64
+CHUNKS_IN_FLIGHT_PER_JOB = 2
+
+DEFAULT_REPORT_FILE = "seecr-license-report.json"
+
+FILE_ERRORS = (UnrecognizedFileType, RuntimeError, OSError, UnicodeDecodeError)
+
 
 class ApplyLicense:
     def __init__(
-        self, config, forceUpdate=False, changedOnly=True, dryRun=False, **kwargs
+        self,
+        config,
+        forceUpdate=False,
+        changedOnly=True,
+        dryRun=False,
+        jobs=1,
+        cachePath=None,
+        gitFiles=False,
+        includeUntracked=False,
+        since=None,
+        yearsFromGit=False,
+        ioThreads=0,
+        report=None,
+        reportFile=None,
+        check=False,
+        failFast=False,
+        writeStrategy=FAST,
+        exclude=None,
+        include=None,
+        nestedConfigs=None,
+        configRoot=None,
+        profile=None,
+        memoryCache=False,
+        **kwargs,
     ):
         self.license = config.license
         self.configuredCopyrights = config.copyrightSet(**kwargs)
+        self._config = config
+        self._copyrightArgs = kwargs
+        self._select = kwargs.get("select")
+        self._yearsFromGit = yearsFromGit
+        self._historyYears = None
+        self._rootScope = _ConfigScope(config, self.configuredCopyrights)
+        self._nestedConfigs = nestedConfigs
+        self._configRoot = realpath(configRoot or ".")
+        self._scopes = {}
         self._forceUpdate = forceUpdate
-        self._changedOnly = changedOnly
-        self._dryRun = dryRun
+        self._changedOnly = changedOnly or since is not None
+        self._since = since
+        self.check = check
+        self._failFast = failFast
+        self.dryRun = dryRun or check
+        self.writeStrategy = writeStrategy
+        self._profile = profile
+        self._exclude = exclude or []
+        self._include = include or []
+        self._jobs = cpu_count() if jobs == 0 else int(jobs or 1)
+        self._ioThreads = ioThreads
+        if self._ioThreads and self._jobs > 1:
+            raise ValueError("Use either multiple jobs or I/O threads, not both.")
+        self._report = report
+        self._reportFile = reportFile or DEFAULT_REPORT_FILE
+        self._gitFiles = gitFiles
+        self._includeUntracked = includeUntracked
+        self._cache = None
+        if cachePath is None and memoryCache:
+            self._cache = LicenseCache(None, None)
+        elif cachePath is not None:
+            self._cache = LicenseCache(
+                cachePath,
+                fingerprint(
+                    VERSION, self.license.fingerprint(), self.configuredCopyrights
+                ),
+            )
 
     @classmethod
     def fromFile(cls, configPath, **kwargs):
-        return cls(
-            cls.Config(json.loads(pathlib.Path(configPath).read_text())), **kwargs
-        )
+        kwargs.setdefault("configRoot", dirname(realpath(configPath)))
+        with open(configPath) as f:
+            return cls(cls.Config(json.load(f)), **kwargs)
 
     def run(self, paths):
+        self.loadHistoryYears()
         if self._changedOnly is True:
-            changes = git_status(fullPath=True)
-            paths = [
-                p for status, paths in changes.items() if "M" in status for p in paths
-            ]
+            candidates = self._changedCandidates(paths)
+        else:
+            candidates = self.candidates(paths)
+        runReport = self.runReport()
+        if runReport is not None:
+            candidates = runReport.timedCandidates(candidates)
+        summary = self.profiled(self._runEngine, candidates, runReport)
+        self.save(runReport)
+        if summary["written"]:
+            print(
+                "Wrote %d files in %.3fs using the %s write strategy, %.0f files/s."
+                % (
+                    summary["written"],
+                    summary["writeSeconds"],
+                    self.writeStrategy,
+                    summary["written"] / (summary["writeSeconds"] or 1e-9),
+                )
+            )
+        if self.check:
+            print("%(updated)d files need a license update." % summary)
+        else:
+            print(
+                "Examined %(examined)d files, updated %(updated)d, skipped %(skipped)d, cached %(cached)d."
+                % summary
+            )
+        return summary
+
+    def applyToBuffers(self, buffers):
+        """Applies the license to (name, bytes) pairs without touching disk.
+        The name only determines the file type. Returns a FileResult per
+        buffer, with the outcome and the (possibly updated) bytes as data."""
+        return [self.processBuffer(name, data) for name, data in buffers]
+
+    def runReport(self):
+        """A new RunReport if a report was asked for, otherwise None."""
+        return None if self._report is None else RunReport()
+
+    def save(self, runReport=None):
+        """Saves the cache, if any, and writes the report of a run."""
+        if self._cache is not None:
+            self._cache.save()
+        if runReport is not None:
+            runReport.write(self._reportFile)
+
+    def record(self, result):
+        """Remembers the state of a processed file in the cache, if any."""
+        if self._cache is not None and result.state is not None:
+            self._cache.record(result.filepath, *result.state)
+
+    def profiled(self, f, *args):
+        """Calls f, profiled when asked for, and returns what it returns."""
+        if self._profile is None:
+            return f(*args)
+        from .profiling import RunProfile
+
+        runProfile = RunProfile(self._profile)
+        runProfile.start()
+        try:
+            result = f(*args)
+        finally:
+            runProfile.stop()
+        runProfile.merge()
+        return result
+
+    def loadHistoryYears(self, cwd=None, rev=None):
+        """Reads the years of all files from the git history of cwd, or of rev
+        in it, once per run or session, if they are to be used as copyright
+        years."""
+        if self._yearsFromGit:
+            self._historyYears = git_history_years(cwd, rev=rev)
 
+    def _runEngine(self, candidates, runReport):
+        if self._jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(
+                max_workers=self._jobs, initializer=_initWorker, initargs=(self,)
+            )
+            try:
+                return self.handleResults(
+                    _mapInWindow(
+                        executor, candidates, self._jobs * CHUNKS_IN_FLIGHT_PER_JOB
+                    ),
+                    runReport,
+                )
+            finally:
+                executor.shutdown(cancel_futures=True)
+        if self._ioThreads:
+            from .asyncengine import AsyncEngine
+
+            return self.handleResults(
+                AsyncEngine(self, self._ioThreads).results(candidates), runReport
+            )
+        return self.handleResults(
+            (self.processFile(filepath, explicit) for filepath, explicit in candidates),
+            runReport,
+        )
+
+    def candidates(self, paths):
+        """The files to process with whether they were given explicitly. Each
+        file is yielded once, also when paths overlap or repeat."""
+        seen = set()
+        for filepath, explicit in self._pathCandidates(paths):
+            key = realpath(filepath)
+            if key not in seen:
+                seen.add(key)
+                yield filepath, explicit
+
+    def _pathCandidates(self, paths):
         for path in paths:
-            if isfile(path):
-                try:
-                    self._maybeUpdateLicense(path)
-                except UnrecognizedFileType:
-                    print("Skipped '%s', filetype not recognized." % path)
+            if path == "-":
+                for line in sys.stdin:
+                    filepath = line.rstrip("\n")
+                    if filepath and isfile(filepath):
+                        yield filepath, False
+            elif isfile(path):
+                yield path, True
+            elif isdir(path) and self._gitFiles:
+                matcher = self.matcherFor(path)
+                for filepath in git_ls_files(path, untracked=self._includeUntracked):
+                    if isfile(filepath) and not matcher.excludes(
+                        relpath(filepath, path).replace(sep, "/")
+                    ):
+                        yield filepath, False
             elif isdir(path):
+                matcher = self.matcherFor(path)
                 for curdir, subdirs, files in walk(path):
                     if should_skip_dir(curdir, files):
                         print("Skipped '%s'" % basename(curdir))
                         del subdirs[:]
                         continue
-
+                    prefix = relpath(curdir, path).replace(sep, "/") + "/"
+                    if prefix == "./":
+                        prefix = ""
+                    for subdir in subdirs[:]:
+                        if matcher.excludes(prefix + subdir + "/"):
+                            print("Skipped '%s'" % subdir)
+                            subdirs.remove(subdir)
                     for file in files:
-                        if file.startswith(".") and file.endswith(".swp"):
-                            continue
-                        try:
-                            self._maybeUpdateLicense(join(curdir, file))
-                        except UnrecognizedFileType:
-                            continue
+                        if not matcher.excludes(prefix + file):
+                            yield join(curdir, file), False
             else:
                 print(
                     "Skipped '%s', it can not be recognized as either a file or a directory."
                     % path
                 )
 
-    def _maybeUpdateLicense(self, filepath):
-        sf = SourceFile(filepath)
-        print("Examining %s" % filepath)
-        sf.maybeUpdateLicense(
-            self.license,
-            self.configuredCopyrights,
-            forceUpdate=self._forceUpdate,
-            dryRun=self._dryRun,
+    def matcherFor(self, root):
+        return PathMatcher.forRoot(
+            root, DEFAULT_IGNORE_RULES, self._exclude, self._include
+        )
+
+    def _changedCandidates(self, paths):
+        matchers = [(realpath(path), self.matcherFor(path)) for path in paths]
+        for filepath in git_changed_files(since=self._since):
+            if isfile(filepath) and any(
+                commonpath([path, realpath(filepath)]) == path
+                and not matcher.excludes(
+                    relpath(realpath(filepath), path).replace(sep, "/")
+                )
+                for path, matcher in matchers
+            ):
+                yield filepath, False
+
+    def handleResults(self, results, runReport=None, raiseErrors=True):
+        summary = dict(examined=0, updated=0, skipped=0, cached=0, errors=0)
+        writeBatch = WriteBatch(self.writeStrategy)
+        try:
+            self._summarize(results, summary, runReport, raiseErrors, writeBatch)
+        finally:
+            writeBatch.finish()
+        summary["written"] = writeBatch.files
+        summary["writeSeconds"] = writeBatch.seconds
+        return summary
+
+    def _summarize(self, results, summary, runReport, raiseErrors, writeBatch):
+        for result in results:
+            filepath, outcome = result.filepath, result.outcome
+            if runReport is not None:
+                runReport.add(result)
+            self.record(result)
+            if outcome == CACHED:
+                summary["cached"] += 1
+                continue
+            if outcome == UNRECOGNIZED:
+                summary["skipped"] += 1
+                if result.explicit:
+                    print("Skipped '%s', filetype not recognized." % filepath)
+                continue
+            if outcome == ERROR:
+                if raiseErrors and runReport is None and not self.check:
+                    raise result.error
+                summary["errors"] += 1
+                print("Error in %s: %s" % (filepath, result.error))
+                if self._failFast:
+                    break
+                continue
+            summary["examined"] += 1
+            if self.check:
+                if outcome in (UPDATED, INSERTED):
+                    summary["updated"] += 1
+                    print("License needs updating in %s" % filepath)
+                    if self._failFast:
+                        break
+                continue
+            print("Examining %s" % filepath)
+            if outcome in (UPDATED, INSERTED):
+                summary["updated"] += 1
+                if not self.dryRun:
+                    writeBatch.add(result)
+                print("Updated %s" % filepath)
+
+    def processFile(self, filepath, explicit, dryRun=None):
+        """Processes one file and returns its FileResult."""
+        steps = self.processSteps(filepath, explicit, dryRun)
+        value = error = None
+        while True:
+            try:
+                call = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = call[0](*call[1:]), None
+            except Exception as e:
+                value, error = None, e
+
+    def processSteps(self, filepath, explicit, dryRun=None):
+        """Processes one file as a generator that yields each blocking call
+        as a (function, *args) tuple, to be sent its return value or thrown
+        its exception, and that returns the FileResult. processFile makes
+        the calls in place, the asyncio engine in its threads."""
+        dryRun = self.dryRun if dryRun is None else dryRun
+        result = FileResult(filepath, explicit)
+        sf = None
+        try:
+            license, configuredCopyrights, variant = self._settingsFor(filepath)
+            if (yield self._isCached, filepath, variant):
+                result.outcome = CACHED
+                return result
+            sf = yield SourceFile, filepath
+            newHead = self._decide(sf, license, configuredCopyrights, result, dryRun)
+            if newHead is not None:
+                yield self._writeFile, sf, newHead, result
+            result.state = yield self._stateAfter, result, variant, dryRun
+        except FILE_ERRORS as e:
+            _failed(result, e)
+        if sf is not None:
+            result.timings = sf.timings
+        return result
+
+    def _isCached(self, filepath, variant):
+        return (
+            self._cache is not None
+            and not self._forceUpdate
+            and self._cache.isCurrent(filepath, variant)
+        )
+
+    def _decide(self, sf, license, configuredCopyrights, result, dryRun):
+        """Sets the outcome for a read SourceFile and returns the new head
+        to write, or None if there is nothing to write."""
+        mergedCopyrights = sf.mergedCopyrightSet(
+            configuredCopyrights, forceUpdate=self._forceUpdate
+        )
+        result.outcome = UNCHANGED
+        if mergedCopyrights is None:
+            return None
+        result.outcome = UPDATED if sf.hasLicense() else INSERTED
+        if dryRun:
+            return None
+        return sf.licensedHead(license, mergedCopyrights)
+
+    def _writeFile(self, sf, newHead, result):
+        if self.writeStrategy == STAGED:
+            result.staged = sf._writeTemp(newHead)
+        else:
+            sf._write(newHead, fsync=self.writeStrategy == DURABLE)
+
+    def _stateAfter(self, result, variant, dryRun):
+        """The state to cache for a processed file, None if there is no cache
+        or the file still needs an update that was not written."""
+        if self._cache is None or (dryRun and result.outcome in (UPDATED, INSERTED)):
+            return None
+        return fileState(result.staged or result.filepath), variant
+
+    def processBuffer(self, name, data, filepath=None):
+        """Like processFile for content in memory. The settings are those
+        for filepath if given, for instance where a blob would be checked
+        out, otherwise for name."""
+        result = FileResult(name, False, UNCHANGED)
+        result.data = data
+        try:
+            license, configuredCopyrights, _ = self._settingsFor(filepath or name)
+            sf = SourceFile(name, data=data)
+            newHead = self._decide(sf, license, configuredCopyrights, result, False)
+            if newHead is not None:
+                result.data = newHead
+            result.timings = sf.timings
+        except FILE_ERRORS as e:
+            _failed(result, e)
+        return result
+
+    def _settingsFor(self, filepath):
+        """The license, the configured copyrights and the cache variant that
+        apply to a file."""
+        scope = self._rootScope
+        if self._nestedConfigs is not None:
+            scope = self._scopeFor(dirname(realpath(filepath)))
+        if self._historyYears is None:
+            return scope.license, scope.configuredCopyrights, scope.key
+        years = self._historyYears.get(realpath(filepath))
+        if not years:
+            return scope.license, scope.configuredCopyrights, scope.key
+        variant = ",".join(str(year) for year in sorted(years))
+        copyrights = scope.copyrightsByYears.get(variant)
+        if copyrights is None:
+            copyrights = scope.copyrightsByYears[variant] = scope.config.copyrightSet(
+                years=years, select=self._select
+            )
+        return scope.license, copyrights, ";".join(filter(None, [scope.key, variant]))
+
+    def _scopeFor(self, directory):
+        """The scope of the nearest nested config in or above directory, up
+        to the config root. Every directory is looked at once."""
+        scope = self._scopes.get(directory)
+        if scope is not None:
+            return scope
+        if directory == self._configRoot or (
+            commonpath([self._configRoot, directory]) != self._configRoot
+        ):
+            scope = self._rootScope
+        else:
+            scope = self._scopeFor(dirname(directory))
+            configPath = join(directory, self._nestedConfigs)
+            if isfile(configPath):
+                scope = self._nestedScope(scope, configPath)
+        self._scopes[directory] = scope
+        return scope
+
+    def _nestedScope(self, parent, configPath):
+        """Raises RuntimeError for an invalid config, which is reported for
+        each file it would apply to."""
+        try:
+            with open(configPath) as f:
+                nestedDict = json.load(f)
+            configDict = _inheritConfig(parent.config.configDict, nestedDict)
+            config = self.Config(configDict, quiet=True)
+            configuredCopyrights = config.copyrightSet(**self._copyrightArgs)
+        except (ValueError, KeyError, TypeError) as e:
+            raise RuntimeError("Invalid config %s: %s" % (configPath, e))
+        return _ConfigScope(
+            config,
+            configuredCopyrights,
+            key=fingerprint(json.dumps(configDict, sort_keys=True))[:16],
         )
 
     class Config:
-        def __init__(self, configDict):
-            license_path = _getLicenseFile(configDict["license"])
+        def __init__(self, configDict, quiet=False):
+            self.configDict = deepcopy(configDict)
+            license_path = _getLicenseFile(configDict["license"], quiet=quiet)
             self.license = License.fromFile(
                 license_path,
                 project=configDict.get("project"),
@@ -118,8 +521,8 @@ class ApplyLicense:
             else:
                 self._copyrights.update(copyrights)
 
-        def copyrightSet(self, year=None, select=None, **_):
-            year = int(year or currentYear)
+        def copyrightSet(self, year=None, select=None, years=None, **_):
+            years = sorted(years or [int(year or currentYear)])
             selected = self._copyrightsSelected[:]
             if not selected:
                 for key in (
@@ -130,16 +533,102 @@ class ApplyLicense:
                     selected.append(self._copyrights[key])
             if not selected:
                 raise ValueError("No copyrights configured")
-            return CopyrightSet([dict(c, years=[year]) for c in selected])
+            return CopyrightSet([dict(c, years=years) for c in selected])
+
+
+class _ConfigScope(object):
+    """The configuration that applies to a directory tree, with its license
+    and copyright sets kept for all files in it."""
+
+    def __init__(self, config, configuredCopyrights, key=""):
+        self.config = config
+        self.license = config.license
+        self.configuredCopyrights = configuredCopyrights
+        self.copyrightsByYears = {}
+        self.key = key
+
+
+def _inheritConfig(parent, nested):
+    """A nested config overrides the keys of its parent; holders given by
+    key in both are combined, with the nested ones taking precedence."""
+    configDict = dict(parent, **nested)
+    parentCopyrights = parent.get("copyrights")
+    nestedCopyrights = nested.get("copyrights")
+    if isinstance(parentCopyrights, dict) and isinstance(nestedCopyrights, dict):
+        configDict["copyrights"] = dict(parentCopyrights, **nestedCopyrights)
+    return deepcopy(configDict)
+
 
+def _failed(result, error):
+    if isinstance(error, UnrecognizedFileType):
+        result.outcome = UNRECOGNIZED
+    else:
+        result.outcome = ERROR
+        result.error = error
 
-def _getLicenseFile(licenseType):
-    license_path = licenses.get(licenseType)
+
+def licenseFiles():
+    """The available license templates by name, looked up on first use."""
+    global _licenseFiles
+    if _licenseFiles is None:
+        import importlib.resources as resources
+
+        license_path = resources.files("seecrlicense") / "license-data"
+        _licenseFiles = {f.stem: f for f in license_path.glob("*.header")}
+    return _licenseFiles
+
+
+_licenseFiles = None
+
+
+def __getattr__(name):
+    if name == "licenses":
+        return licenseFiles()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _getLicenseFile(licenseType, quiet=False):
+    license_path = licenseFiles().get(licenseType)
     if license_path:
-        print(f"Using license {licenseType}")
+        if not quiet:
+            print(f"Using license {licenseType}")
         return license_path
     raise KeyError("No such license: %s" % licenseType)
 
 
 def should_skip_dir(curdir, files):
     return basename(curdir) in IGNORED_DIRECTORIES or "pyvenv.cfg" in files
+
+
+_workerApplyLicense = None
+
+
+def _initWorker(applyLicense):
+    global _workerApplyLicense
+    _workerApplyLicense = applyLicense
+    if applyLicense._profile is not None:
+        from .profiling import startWorkerProfile
+
+        startWorkerProfile(applyLicense._profile)
+
+
+def _processInWorker(chunk):
+    return [_workerApplyLicense.processFile(*candidate) for candidate in chunk]
+
+
+def _mapInWindow(executor, candidates, maxInFlight):
+    """Processes chunks of candidates in the worker processes and yields the
+    results in order. Unlike executor.map, at most maxInFlight chunks are
+    submitted ahead of the results being handled, so handling starts while
+    candidates are still being found and stopping early stops finding them."""
+    pending = deque()
+    candidates = iter(candidates)
+    while True:
+        chunk = list(islice(candidates, CHUNKSIZE))
+        if not chunk:
+            break
+        pending.append(executor.submit(_processInWorker, chunk))
+        if len(pending) >= maxInFlight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
@@ -24,7 +24,12 @@
 
 from .applylicense import ApplyLicense
 
+from os import environ
+from subprocess import run
+
+import io
 import json
+import pstats
 import pytest
 
 
@@ -479,3 +484,589 @@ def test_should_skip_dot_git_directory(tmp_path, capsys):
     assert skipped == {"Skipped '.git'", "Skipped 'python-env'"}
     assert script1.read_text() == "#!/bin/bash\n"
     assert script2.read_text() == "#!/bin/bash\n"
+
+
+def test_fail_fast_with_jobs_stops_finding_candidates(tmp_path, capsys):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        jobs=2,
+        check=True,
+        failFast=True,
+    )
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+    found = []
+
+    def candidates():
+        for i in range(10000):
+            found.append(i)
+            yield str(sourceFile), False
+
+    summary = applyLicense._runEngine(candidates(), None)
+
+    assert summary["updated"] == 1
+    assert len(found) < 1000
+
+
+def test_run_with_multiple_jobs(tmp_path, capsys):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        jobs=2,
+    )
+
+    sourceFiles = [tmp_path / f"source{i}.py" for i in range(10)]
+    for sourceFile in sourceFiles:
+        sourceFile.write_text("# stuff")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+
+    applyLicense.run([tmp_path])
+
+    for sourceFile in sourceFiles:
+        assert "# Copyright (C) 2007 CQ2 http://cq2.nl" in sourceFile.read_text()
+    lines = capsys.readouterr().out.strip().split("\n")
+    assert sorted(l for l in lines if l.startswith("Updated")) == sorted(
+        f"Updated {sourceFile.as_posix()}" for sourceFile in sourceFiles
+    )
+    assert lines[-1] == "Examined 10 files, updated 10, skipped 1, cached 0."
+
+    applyLicense.run([tmp_path])
+    assert capsys.readouterr().out.strip().split("\n")[-1] == (
+        "Examined 10 files, updated 0, skipped 1, cached 0."
+    )
+
+
+def test_run_with_cache(tmp_path, capsys):
+    config = ApplyLicense.Config(
+        {
+            "project": "Some Project",
+            "license": "arr",
+            "copyrights": [
+                {"name": "CQ2", "url": "http://cq2.nl"},
+            ],
+        }
+    )
+    cachePath = tmp_path / "cache"
+    srcPath = tmp_path / "src"
+    srcPath.mkdir()
+    sourceFile = srcPath / "source.py"
+    sourceFile.write_text("# stuff")
+    (srcPath / "other.py").write_text("# other stuff")
+
+    def run(year):
+        ApplyLicense(
+            config, year=year, changedOnly=False, cachePath=cachePath
+        ).run([srcPath])
+        return capsys.readouterr().out.strip().split("\n")[-1]
+
+    assert run("2007") == "Examined 2 files, updated 2, skipped 0, cached 0."
+    assert run("2007") == "Examined 0 files, updated 0, skipped 0, cached 2."
+
+    sourceFile.write_text("# new stuff")
+    assert run("2007") == "Examined 1 files, updated 1, skipped 0, cached 1."
+    assert "2007 CQ2" in sourceFile.read_text()
+
+    assert run("2008") == "Examined 2 files, updated 2, skipped 0, cached 0."
+    assert "2007-2008 CQ2" in sourceFile.read_text()
+
+
+def test_run_with_git_files(tmp_path, capsys):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        gitFiles=True,
+    )
+    run(["git", "init", "-q", tmp_path.as_posix()], check=True)
+    (tmp_path / ".gitignore").write_text("build/\n")
+    tracked = tmp_path / "tracked.py"
+    tracked.write_text("# stuff")
+    untracked = tmp_path / "untracked.py"
+    untracked.write_text("# stuff")
+    ignored = tmp_path / "build" / "ignored.py"
+    ignored.parent.mkdir()
+    ignored.write_text("# stuff")
+    run(["git", "add", "tracked.py", ".gitignore"], cwd=tmp_path, check=True)
+
+    applyLicense.run([tmp_path])
+    assert "Copyright (C) 2007 CQ2" in tracked.read_text()
+    assert untracked.read_text() == "# stuff"
+    assert ignored.read_text() == "# stuff"
+    assert "Examined 1 files" in capsys.readouterr().out
+
+    applyLicense._includeUntracked = True
+    applyLicense.run([tmp_path])
+    assert "Copyright (C) 2007 CQ2" in untracked.read_text()
+    assert ignored.read_text() == "# stuff"
+
+
+def test_run_changed_only_since(tmp_path, monkeypatch):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        since="main",
+    )
+    git = lambda *args: run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@example.org", *args],
+        cwd=tmp_path,
+        check=True,
+    )
+    git("init", "-q", "-b", "main")
+    for name in ["old.py", "changed.py", "added.py", "other/added.py"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("# stuff")
+    git("add", "old.py", "changed.py")
+    git("commit", "-q", "-m", "initial")
+    git("checkout", "-q", "-b", "feature")
+    (tmp_path / "changed.py").write_text("# changed stuff")
+    git("commit", "-q", "-a", "-m", "feature")
+    monkeypatch.chdir(tmp_path)
+
+    applyLicense.run([tmp_path / "changed.py", tmp_path / "added.py"])
+
+    assert (tmp_path / "old.py").read_text() == "# stuff"
+    assert "2007 CQ2" in (tmp_path / "changed.py").read_text()
+    assert "2007 CQ2" in (tmp_path / "added.py").read_text()
+    assert (tmp_path / "other" / "added.py").read_text() == "# stuff"
+
+
+def test_run_with_years_from_git(tmp_path, monkeypatch):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2030",
+        changedOnly=False,
+        yearsFromGit=True,
+    )
+    git = lambda *args, year: run(
+        ["git", "-c", "user.name=T", "-c", "user.email=t@example.org", *args],
+        cwd=tmp_path,
+        check=True,
+        env=dict(environ, GIT_AUTHOR_DATE="%s-06-01T12:00:00" % year),
+    )
+    git("init", "-q", year=2000)
+    for year, names in [(2010, ["old.py", "both.py"]), (2012, ["both.py"])]:
+        for name in names:
+            (tmp_path / name).write_text("# %s" % year)
+        git("add", ".", year=year)
+        git("commit", "-q", "-m", str(year), year=year)
+    (tmp_path / "new.py").write_text("# stuff")
+    monkeypatch.chdir(tmp_path)
+
+    applyLicense.run([tmp_path])
+
+    assert "Copyright (C) 2010 CQ2" in (tmp_path / "old.py").read_text()
+    assert "Copyright (C) 2010, 2012 CQ2" in (tmp_path / "both.py").read_text()
+    assert "Copyright (C) 2030 CQ2" in (tmp_path / "new.py").read_text()
+
+
+def test_run_with_json_report(tmp_path, capsys):
+    reportFile = tmp_path / "report.json"
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        report="json",
+        reportFile=reportFile,
+    )
+    srcPath = tmp_path / "src"
+    srcPath.mkdir()
+    (srcPath / "new.py").write_text("# stuff")
+    (srcPath / "old.py").write_text(
+        "## begin license ##\n#\n# Copyright (C) 2006 CQ2 http://cq2.nl\n#\n"
+        "## end license ##\n"
+    )
+    (srcPath / "current.py").write_text(
+        "## begin license ##\n#\n# Copyright (C) 2007 CQ2 http://cq2.nl\n#\n"
+        "## end license ##\n"
+    )
+    (srcPath / "broken.py").write_text("## begin license ##\n")
+    (srcPath / "image.png").write_bytes(b"\x89PNG")
+
+    applyLicense.run([srcPath])
+
+    assert "Error in %s" % (srcPath / "broken.py") in capsys.readouterr().out
+    report = json.loads(reportFile.read_text())
+    assert sorted(
+        (f["path"].rsplit("/", 1)[-1], f["outcome"]) for f in report["files"]
+    ) == [
+        ("broken.py", "error"),
+        ("current.py", "unchanged"),
+        ("image.png", "skipped-unrecognized"),
+        ("new.py", "inserted"),
+        ("old.py", "updated"),
+    ]
+    new = [f for f in report["files"] if f["path"].endswith("new.py")][0]
+    assert set(new["timings"]) == {"read", "parse", "merge", "render", "write"}
+    assert report["totals"]["files"] == 5
+
+
+def test_apply_to_buffers(tmp_path):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+    )
+    current = (
+        b"## begin license ##\n#\n# All rights reserved.\n#\n"
+        b"# Copyright (C) 2007 CQ2 http://cq2.nl\n#\n"
+        b'# This file is part of "Some Project"\n#\n## end license ##\n\n# code\n'
+    )
+
+    results = applyLicense.applyToBuffers(
+        [
+            ("gen/new.py", b"# code\n"),
+            ("gen/current.py", current),
+            ("gen/script", b"#!/bin/sh\necho\n"),
+            ("gen/image.png", b"\x89PNG"),
+            ("gen/broken.py", b"## begin license ##\n"),
+        ]
+    )
+
+    assert [(r.filepath, r.outcome) for r in results] == [
+        ("gen/new.py", "inserted"),
+        ("gen/current.py", "unchanged"),
+        ("gen/script", "inserted"),
+        ("gen/image.png", "skipped-unrecognized"),
+        ("gen/broken.py", "error"),
+    ]
+    assert results[0].data == current
+    assert results[1].data is current
+    assert results[2].data.startswith(b"#!/bin/sh\n## begin license ##\n")
+    assert results[3].data == b"\x89PNG"
+    assert "'begin license' marker found" in str(results[4].error)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("writeStrategy", ["fast", "durable", "staged"])
+def test_write_strategies(tmp_path, capsys, writeStrategy):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        writeStrategy=writeStrategy,
+        cachePath=tmp_path / "cache.json",
+    )
+    srcPath = tmp_path / "src"
+    for i in range(4):
+        (srcPath / f"dir{i % 2}").mkdir(parents=True, exist_ok=True)
+        (srcPath / f"dir{i % 2}" / f"source{i}.py").write_text("# stuff")
+
+    summary = applyLicense.run([srcPath])
+
+    assert summary["written"] == 4
+    assert sorted(p.name for p in srcPath.rglob("*")) == [
+        "dir0",
+        "dir1",
+        "source0.py",
+        "source1.py",
+        "source2.py",
+        "source3.py",
+    ]
+    assert "2007 CQ2" in (srcPath / "dir1" / "source3.py").read_text()
+    lines = capsys.readouterr().out.strip().split("\n")
+    assert lines[-2].startswith("Wrote 4 files in ")
+    assert f"using the {writeStrategy} write strategy" in lines[-2]
+    assert applyLicense.run([srcPath])["cached"] == 4
+
+
+@pytest.mark.parametrize("writeStrategy", ["fast", "staged"])
+def test_overlapping_paths_are_processed_once(
+    tmp_path, capsys, monkeypatch, writeStrategy
+):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        writeStrategy=writeStrategy,
+    )
+    srcPath = tmp_path / "src"
+    (srcPath / "sub").mkdir(parents=True)
+    (srcPath / "a.py").write_text("# a")
+    (srcPath / "sub" / "b.py").write_text("# b")
+    monkeypatch.setattr("sys.stdin", io.StringIO("%s\n" % (srcPath / "a.py")))
+
+    summary = applyLicense.run(
+        [srcPath, srcPath / "a.py", srcPath / "sub", tmp_path / "src" / ".", "-"]
+    )
+
+    assert (summary["examined"], summary["updated"], summary["written"]) == (2, 2, 2)
+    out = capsys.readouterr().out
+    assert out.count("Updated %s" % (srcPath / "a.py")) == 1
+    assert (srcPath / "a.py").read_text().count("## begin license ##") == 1
+
+
+def test_licenseignore_gitattributes_and_globs(tmp_path, capsys):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        exclude=["*.sh"],
+        include=["tools/keep.sh"],
+    )
+    projectPath = tmp_path / "project"
+    for name in [
+        "app.py",
+        "build/out.py",
+        "vendor/lib/lib.js",
+        "api/service_pb2.py",
+        "tools/run.sh",
+        "tools/keep.sh",
+        ".app.py.swp",
+    ]:
+        (projectPath / name).parent.mkdir(parents=True, exist_ok=True)
+        (projectPath / name).write_text("# code\n")
+    (projectPath / ".licenseignore").write_text("# generated\nbuild/\n")
+    (projectPath / ".gitattributes").write_text(
+        "vendor/** linguist-vendored\napi/*_pb2.py linguist-generated\n"
+    )
+
+    summary = applyLicense.run([str(projectPath)])
+
+    assert summary["updated"] == 2
+    licensed = sorted(
+        p.relative_to(projectPath).as_posix()
+        for p in projectPath.rglob("*")
+        if p.is_file() and "2007 CQ2" in p.read_text()
+    )
+    assert licensed == ["app.py", "tools/keep.sh"]
+    skipped = {
+        l for l in capsys.readouterr().out.split("\n") if l.startswith("Skipped")
+    }
+    assert skipped == {"Skipped 'build'", "Skipped 'vendor'"}
+
+
+def test_nested_configs(tmp_path, capsys):
+    (tmp_path / "license.conf").write_text(
+        json.dumps(
+            {
+                "project": "Monorepo",
+                "license": "arr",
+                "copyrights": {
+                    "seecr": {"name": "Seecr", "url": "https://seecr.nl"},
+                    "cq2": {"name": "CQ2", "url": "http://cq2.nl"},
+                },
+            }
+        )
+    )
+    (tmp_path / "root.py").write_text("# root\n")
+    for name, config in [
+        ("alpha", {"project": "Alpha"}),
+        (
+            "beta",
+            {
+                "copyrights": [
+                    {"name": "Seecr", "url": "https://seecr.nl"},
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ]
+            },
+        ),
+        ("beta/gamma", {"description": "The gamma part."}),
+        ("delta", None),
+        (
+            "epsilon",
+            {"copyrights": {"seecr": {"name": "Seecr Labs", "url": "https://seecr.nl"}}},
+        ),
+    ]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "code.py").write_text("# code\n")
+        if config is not None:
+            (tmp_path / name / "license.conf").write_text(json.dumps(config))
+
+    def applyLicense():
+        return ApplyLicense.fromFile(
+            tmp_path / "license.conf",
+            nestedConfigs="license.conf",
+            year="2007",
+            changedOnly=False,
+            cachePath=tmp_path / "cache.json",
+        )
+
+    def header(name):
+        text = (tmp_path / name).read_text()
+        return text[: text.index("## end license ##")]
+
+    summary = applyLicense().run([str(tmp_path)])
+
+    assert summary["updated"] == 6
+    assert 'part of "Monorepo"' in header("root.py")
+    assert 'part of "Monorepo"' in header("delta/code.py")
+    assert "CQ2" not in header("delta/code.py")
+    assert 'part of "Alpha"' in header("alpha/code.py")
+    assert "2007 CQ2" in header("beta/code.py")
+    assert "2007 Seecr" in header("beta/code.py")
+    assert "2007 CQ2" in header("beta/gamma/code.py")
+    assert "The gamma part." in header("beta/gamma/code.py")
+    assert "The gamma part." not in header("beta/code.py")
+    assert "2007 Seecr Labs" in header("epsilon/code.py")
+
+    assert applyLicense().run([str(tmp_path)])["cached"] == 6
+    (tmp_path / "beta" / "license.conf").write_text(json.dumps({"project": "Beta"}))
+    summary = applyLicense().run([str(tmp_path)])
+    assert (summary["cached"], summary["examined"]) == (4, 2)
+
+
+@pytest.mark.parametrize(
+    "nested, message",
+    [
+        ("{not json", "Expecting property name"),
+        ('{"license": "nope"}', "No such license"),
+    ],
+)
+def test_invalid_nested_config_is_a_file_error(tmp_path, capsys, nested, message):
+    (tmp_path / "license.conf").write_text(
+        json.dumps(
+            {
+                "project": "Monorepo",
+                "license": "arr",
+                "copyrights": [{"name": "CQ2", "url": "http://cq2.nl"}],
+            }
+        )
+    )
+    (tmp_path / "good.py").write_text("# good\n")
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "license.conf").write_text(nested)
+    (tmp_path / "broken" / "code.py").write_text("# code\n")
+    (tmp_path / "fine").mkdir()
+    (tmp_path / "fine" / "license.conf").write_text('{"project": "Fine"}')
+    (tmp_path / "fine" / "code.py").write_text("# code\n")
+    applyLicense = ApplyLicense.fromFile(
+        tmp_path / "license.conf",
+        nestedConfigs="license.conf",
+        year="2007",
+        changedOnly=False,
+        check=True,
+    )
+    capsys.readouterr()
+
+    summary = applyLicense.run([str(tmp_path)])
+
+    assert (summary["errors"], summary["updated"]) == (2, 2)
+    out = capsys.readouterr().out
+    assert "Error in %s: Invalid config %s" % (
+        tmp_path / "broken" / "code.py",
+        tmp_path / "broken" / "license.conf",
+    ) in out
+    assert message in out
+    assert "Using license" not in out
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_profile(tmp_path, capsys, jobs):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(
+            {
+                "project": "Some Project",
+                "license": "arr",
+                "copyrights": [
+                    {"name": "CQ2", "url": "http://cq2.nl"},
+                ],
+            }
+        ),
+        year="2007",
+        changedOnly=False,
+        jobs=jobs,
+        profile=tmp_path / "profile",
+    )
+    srcPath = tmp_path / "src"
+    srcPath.mkdir()
+    for i in range(20):
+        (srcPath / f"source{i}.py").write_text("# stuff")
+    (tmp_path / "profile").mkdir()
+    (tmp_path / "profile" / "other.prof").write_text("not ours")
+    (tmp_path / "profile" / "worker-1.prof").write_text("stale")
+
+    applyLicense.run([srcPath])
+
+    assert (tmp_path / "profile" / "other.prof").read_text() == "not ours"
+    profiles = {p.name for p in (tmp_path / "profile").iterdir()} - {"other.prof"}
+    workers = profiles - {"main.prof", "merged.prof"}
+    assert len(profiles - workers) == 2
+    assert (jobs == 1) == (len(workers) == 0) and len(workers) <= jobs
+    assert all(name.startswith("worker-") for name in workers)
+    stats = pstats.Stats(str(tmp_path / "profile" / "merged.prof"))
+    assert any(
+        filename.endswith("sourcefile.py") for filename, _, _ in stats.stats
+    )
+    assert "Profiled %d processes" % (len(workers) + 1) in capsys.readouterr().out
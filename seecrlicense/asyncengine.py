@@ -0,0 +1,76 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+
+IN_FLIGHT_PER_THREAD = 4
+
+
+class AsyncEngine(object):
+    """Keeps many files in flight on an asyncio event loop. Blocking reads,
+    writes and stats go to a bounded pool of threads; parsing, merging and
+    rendering run on the loop itself. Results are yielded in input order."""
+
+    def __init__(self, applyLicense, ioThreads):
+        self._applyLicense = applyLicense
+        self._ioThreads = ioThreads
+        self._maxInFlight = ioThreads * IN_FLIGHT_PER_THREAD
+
+    def results(self, candidates):
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self._ioThreads))
+        pending = deque()
+        try:
+            for filepath, explicit in candidates:
+                pending.append(loop.create_task(self._processFile(filepath, explicit)))
+                if len(pending) >= self._maxInFlight:
+                    yield loop.run_until_complete(pending.popleft())
+            while pending:
+                yield loop.run_until_complete(pending.popleft())
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.wait(pending, return_when=asyncio.ALL_COMPLETED)
+                )
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    async def _processFile(self, filepath, explicit):
+        steps = self._applyLicense.processSteps(filepath, explicit)
+        value = error = None
+        while True:
+            try:
+                call = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = await self._io(*call), None
+            except Exception as e:
+                value, error = None, e
+
+    async def _io(self, f, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, f, *args)
@@ -0,0 +1,93 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import pytest
+
+from .report import UNCHANGED, INSERTED, UNRECOGNIZED, ERROR
+from .asyncengine import AsyncEngine
+
+
+def test_results_in_order(tmp_path, applyLicense):
+    candidates = []
+    for i in range(50):
+        sourceFile = tmp_path / f"source{i}.py"
+        sourceFile.write_text("# stuff")
+        candidates.append((sourceFile.as_posix(), False))
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+    candidates.insert(10, ((tmp_path / "image.png").as_posix(), True))
+
+    results = list(AsyncEngine(applyLicense(), 2).results(candidates))
+
+    assert [(r.filepath, r.explicit) for r in results] == candidates
+    assert [r.outcome for r in results] == (
+        [INSERTED] * 10 + [UNRECOGNIZED] + [INSERTED] * 40
+    )
+    assert "2007 CQ2" in (tmp_path / "source42.py").read_text()
+
+    results = list(AsyncEngine(applyLicense(), 2).results(candidates))
+    assert [r.outcome for r in results] == (
+        [UNCHANGED] * 10 + [UNRECOGNIZED] + [UNCHANGED] * 40
+    )
+
+
+def test_dry_run(tmp_path, applyLicense):
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+
+    results = list(
+        AsyncEngine(applyLicense(dryRun=True), 1).results([(sourceFile, False)])
+    )
+
+    assert [(r.filepath, r.outcome, r.state) for r in results] == [
+        (sourceFile, INSERTED, None)
+    ]
+    assert sourceFile.read_text() == "# stuff"
+
+
+def test_errors_are_reported(tmp_path, applyLicense):
+    good = tmp_path / "good.py"
+    good.write_text("# stuff")
+    bad = tmp_path / "bad.py"
+    bad.write_text("## begin license ##\n# stuff")
+
+    results = list(
+        AsyncEngine(applyLicense(), 2).results([(good, False), (bad, False)])
+    )
+    assert [r.outcome for r in results] == [INSERTED, ERROR]
+    assert isinstance(results[1].error, RuntimeError)
+
+
+def test_run_with_io_threads(tmp_path, capsys, applyLicense):
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+
+    applyLicense(ioThreads=4).run([tmp_path])
+
+    assert "2007 CQ2" in sourceFile.read_text()
+    assert capsys.readouterr().out.strip().split("\n")[-1] == (
+        "Examined 1 files, updated 1, skipped 0, cached 0."
+    )
+
+
+def test_jobs_and_io_threads_can_not_be_combined(applyLicense):
+    with pytest.raises(ValueError):
+        applyLicense(ioThreads=4, jobs=2)
@@ -0,0 +1,224 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from os import devnull, makedirs
+from os.path import join, dirname
+from random import Random
+from shutil import rmtree
+from subprocess import run, DEVNULL
+from sys import version_info, executable
+from tempfile import mkdtemp
+from time import perf_counter, strftime, gmtime
+
+import json
+
+from .__version__ import VERSION
+from .applylicense import ApplyLicense
+from .copyrightset import CopyrightSet
+from .sourcefile import (
+    SourceFile,
+    markersByExtension,
+    markersByFilename,
+    C_MARKERS,
+)
+
+HOLDERS = [
+    {"name": "Seecr (Seek You Too B.V.)", "url": "https://seecr.nl"},
+    {"name": "Seek You Too B.V. (CQ2)", "url": "http://cq2.nl"},
+    {"name": "Example Inc.", "url": "https://example.org", "text": "Some text"},
+]
+
+CONFIG = {
+    "project": "Benchmark",
+    "description": "Synthetic tree to benchmark seecr-license.",
+    "license": "GPLv2",
+    "copyrights": {"seecr": HOLDERS[0]},
+}
+
+
+def generateTree(root, files=1000, hugeFiles=2, hugeSize=16 * 1024 * 1024, seed=0):
+    """Writes a synthetic source tree mixing every known file type, with and
+    without existing license headers. Returns the paths written."""
+    random = Random(seed)
+    license = ApplyLicense.Config(dict(CONFIG)).license
+    names = ["file%d" + ext for ext in markersByExtension]
+    names += ["m%d/" + name for name in markersByFilename] + ["script%d"]
+    paths = []
+    for i in range(files):
+        name = names[i % len(names)] % i
+        path = join(root, "dir%d" % (i % 37), "sub%d" % (i % 5), name)
+        body = _body(name, random.randint(10, 200))
+        if i % 3:
+            body = _withLicense(path, body, license, random)
+        _write(path, body)
+        paths.append(path)
+    for i in range(hugeFiles):
+        path = join(root, "huge", "bundle%d.js" % i)
+        line = "var x = %d; // generated\n" % i
+        _write(path, line * (hugeSize // len(line)))
+        paths.append(path)
+    return paths
+
+
+def timeRun(root, **kwargs):
+    applyLicense = ApplyLicense(
+        ApplyLicense.Config(dict(CONFIG)), changedOnly=False, **kwargs
+    )
+    with open(devnull, "w") as out, redirect_stdout(out):
+        t0 = perf_counter()
+        applyLicense.run([root])
+        return perf_counter() - t0
+
+
+def timeHotPaths(paths, repeat=3):
+    license = ApplyLicense.Config(dict(CONFIG)).license
+    configured = CopyrightSet([dict(HOLDERS[0], years=[2026])])
+    timings = dict(read=0.0, merge=0.0, render=0.0, copyrightSetMerge=0.0)
+    for _ in range(repeat):
+        for path in paths:
+            t0 = perf_counter()
+            sf = SourceFile(path)
+            t1 = perf_counter()
+            merged = sf.mergedCopyrightSet(configured, forceUpdate=True)
+            t2 = perf_counter()
+            sf.licensedHead(license, merged)
+            t3 = perf_counter()
+            timings["read"] += t1 - t0
+            timings["merge"] += t2 - t1
+            timings["render"] += t3 - t2
+        current = CopyrightSet(
+            [dict(holder, years=range(2000, 2026, 3)) for holder in HOLDERS]
+        )
+        t0 = perf_counter()
+        for _ in range(len(paths)):
+            current.merge(configured) == current
+        timings["copyrightSetMerge"] += perf_counter() - t0
+    return {key: value / repeat for key, value in timings.items()}
+
+
+STARTUP_COMMANDS = {
+    "importApp": "import seecrlicense.app",
+    "importApplyLicense": "import seecrlicense.applylicense",
+    "help": "from seecrlicense.app import main; main(['--help'])",
+}
+
+
+def timeStartup(repeat=5):
+    """Best wall clock time of a fresh interpreter for each startup command,
+    minus that of an interpreter that does nothing."""
+    baseline = _bestOf(repeat, "pass")
+    return {
+        name: max(_bestOf(repeat, command) - baseline, 0.0)
+        for name, command in STARTUP_COMMANDS.items()
+    }
+
+
+def benchmark(files=1000, hugeFiles=2, hugeSize=16 * 1024 * 1024, jobs=1):
+    root = mkdtemp(prefix="seecr-license-benchmark-")
+    try:
+        paths = generateTree(root, files=files, hugeFiles=hugeFiles, hugeSize=hugeSize)
+        return dict(
+            version=VERSION,
+            python="%d.%d.%d" % version_info[:3],
+            timestamp=strftime("%Y-%m-%dT%H:%M:%SZ", gmtime()),
+            files=len(paths),
+            hugeFiles=hugeFiles,
+            jobs=jobs,
+            firstRun=timeRun(root, jobs=jobs, year="2026"),
+            secondRun=timeRun(root, jobs=jobs, year="2026"),
+            forcedRun=timeRun(root, jobs=jobs, year="2026", forceUpdate=True),
+            hotPaths=timeHotPaths(paths[:files]),
+            startup=timeStartup(),
+        )
+    finally:
+        rmtree(root)
+
+
+def main(args=None):
+    parser = ArgumentParser(
+        description="Benchmark seecr-license on a generated source tree."
+    )
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--huge-files", type=int, default=2, dest="hugeFiles")
+    parser.add_argument(
+        "--huge-size", type=int, default=16 * 1024 * 1024, dest="hugeSize"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument(
+        "--results",
+        default="benchmark-results.jsonl",
+        help="File to append the results to, one JSON object per line",
+    )
+    args = parser.parse_args(args)
+
+    result = benchmark(
+        files=args.files,
+        hugeFiles=args.hugeFiles,
+        hugeSize=args.hugeSize,
+        jobs=args.jobs,
+    )
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+    print(json.dumps(result, indent=2))
+
+
+def _bestOf(repeat, command):
+    timings = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        run([executable, "-c", command], stdout=DEVNULL, check=True)
+        timings.append(perf_counter() - t0)
+    return min(timings)
+
+
+def _body(name, lines):
+    comment = "# code"
+    if markersByExtension.get(name[name.rfind(".") :]) is C_MARKERS:
+        comment = "/* code */"
+    body = "\n".join("%s line %d" % (comment, i) for i in range(lines)) + "\n"
+    if name.startswith("script"):
+        body = "#!/bin/sh\n" + body
+    elif name.endswith(".py"):
+        body = "# -*- coding: utf-8 -*-\n" + body
+    elif name.endswith(".php"):
+        body = "<?php\n" + body
+    return body
+
+
+def _withLicense(path, body, license, random):
+    holders = random.sample(HOLDERS, random.randint(1, len(HOLDERS)))
+    copyrights = CopyrightSet(
+        [
+            dict(holder, years=random.sample(range(2000, 2026), random.randint(1, 5)))
+            for holder in holders
+        ]
+    )
+    _write(path, body)
+    return SourceFile(path).licensedHead(license, copyrights).decode("utf-8")
+
+
+def _write(path, content):
+    makedirs(dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
@@ -0,0 +1,77 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os.path import basename, splitext
+
+import json
+
+from .benchmark import generateTree, timeHotPaths, timeStartup, main
+from .sourcefile import SourceFile, markersByExtension
+
+
+def test_generate_tree(tmp_path):
+    paths = generateTree(tmp_path.as_posix(), files=60, hugeFiles=1, hugeSize=10000)
+
+    assert len(paths) == 61
+    extensions = {splitext(path)[1] for path in paths}
+    assert set(markersByExtension) <= extensions
+    assert "Makefile" in {basename(path) for path in paths}
+    withLicense = [p for p in paths if SourceFile(p).hasLicense()]
+    assert 0 < len(withLicense) < len(paths)
+    assert any(
+        len(SourceFile(p)._parseCopyrightLines()) > 1 for p in withLicense
+    ), "multi holder blocks"
+    assert (tmp_path / "huge" / "bundle0.js").stat().st_size > 9000
+
+
+def test_time_hot_paths(tmp_path):
+    paths = generateTree(tmp_path.as_posix(), files=20, hugeFiles=0)
+    assert set(timeHotPaths(paths, repeat=1)) == {
+        "read",
+        "merge",
+        "render",
+        "copyrightSetMerge",
+    }
+
+
+def test_time_startup():
+    timings = timeStartup(repeat=1)
+    assert set(timings) == {"importApp", "importApplyLicense", "help"}
+    assert all(timing >= 0.0 for timing in timings.values())
+
+
+def test_main_appends_results(tmp_path):
+    results = tmp_path / "results.jsonl"
+    for _ in range(2):
+        main(
+            [
+                "--files=20",
+                "--huge-files=1",
+                "--huge-size=100000",
+                "--results=%s" % results,
+            ]
+        )
+    lines = [json.loads(line) for line in results.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["files"] == 21
+    assert lines[0]["firstRun"] > 0
+    assert "importApp" in lines[0]["startup"]
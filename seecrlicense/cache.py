@@ -0,0 +1,113 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import stat, rename
+from os.path import abspath
+
+import json
+
+
+class LicenseCache(object):
+    """Remembers which files were found to carry an up to date license.
+
+    Entries are stored per absolute path as (mtime, size, content digest) and
+    are only valid for the fingerprint they were recorded with, and for the
+    variant of the configuration that applied to that particular file.  A
+    file whose mtime and size still match is considered current without
+    opening it; if only the mtime changed the content digest decides.
+
+    Without a path the cache only lives in memory."""
+
+    def __init__(self, path, fingerprint):
+        self._path = None if path is None else str(path)
+        self._fingerprint = fingerprint
+        self._entries = {}
+        self._load()
+
+    def isCurrent(self, filepath, variant=""):
+        entry = self._entries.get(_key(filepath))
+        if entry is None or entry[3:] != [variant]:
+            return False
+        try:
+            st = stat(filepath)
+        except OSError:
+            return False
+        mtime, size, digest = entry[:3]
+        if st.st_size != size:
+            return False
+        if st.st_mtime_ns == mtime:
+            return True
+        return contentDigest(filepath) == digest
+
+    def record(self, filepath, state, variant=""):
+        self._entries[_key(filepath)] = list(state) + [variant]
+
+    def forget(self, filepath):
+        self._entries.pop(_key(filepath), None)
+
+    def save(self):
+        if self._path is None:
+            return
+        tmpPath = self._path + ".tmp"
+        with open(tmpPath, "w") as f:
+            json.dump(dict(fingerprint=self._fingerprint, files=self._entries), f)
+        rename(tmpPath, self._path)
+
+    def _load(self):
+        if self._path is None:
+            return
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") == self._fingerprint:
+            self._entries = data.get("files", {})
+
+
+def _key(filepath):
+    return abspath(filepath)
+
+
+def fileState(filepath):
+    st = stat(filepath)
+    return st.st_mtime_ns, st.st_size, contentDigest(filepath)
+
+
+def contentDigest(filepath):
+    from hashlib import sha256
+
+    digest = sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(*parts):
+    from hashlib import sha256
+
+    digest = sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
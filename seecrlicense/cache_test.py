@@ -0,0 +1,78 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import utime
+from hashlib import sha256
+
+from .cache import LicenseCache, fileState, contentDigest, fingerprint
+
+
+def test_unknown_file_is_not_current(tmp_path):
+    cache = LicenseCache(tmp_path / "cache", "fp")
+    assert not cache.isCurrent(tmp_path / "file.py")
+
+
+def test_record_and_reload(tmp_path):
+    source = tmp_path / "file.py"
+    source.write_text("# stuff")
+    cache = LicenseCache(tmp_path / "cache", "fp")
+    cache.record(source, fileState(source))
+    cache.save()
+
+    assert LicenseCache(tmp_path / "cache", "fp").isCurrent(source)
+    assert not LicenseCache(tmp_path / "cache", "other").isCurrent(source)
+
+
+def test_changed_content_is_not_current(tmp_path):
+    source = tmp_path / "file.py"
+    source.write_text("# stuff")
+    cache = LicenseCache(tmp_path / "cache", "fp")
+    cache.record(source, fileState(source))
+
+    source.write_text("# other")
+    st = source.stat()
+    utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert not cache.isCurrent(source)
+
+    source.write_text("# stuff")
+    utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert cache.isCurrent(source), "touched but same content"
+
+    source.write_text("# stuff and more")
+    assert not cache.isCurrent(source)
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    (tmp_path / "cache").write_text("{not json")
+    cache = LicenseCache(tmp_path / "cache", "fp")
+    assert not cache.isCurrent(tmp_path / "cache")
+
+
+def test_fingerprint():
+    assert fingerprint("a", 2024) == fingerprint("a", "2024")
+    assert fingerprint("ab", "c") != fingerprint("a", "bc")
+
+
+def test_content_digest(tmp_path):
+    source = tmp_path / "file"
+    source.write_bytes(b"x" * 100000)
+    assert contentDigest(source) == sha256(b"x" * 100000).hexdigest()
@@ -0,0 +1,92 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os.path import abspath
+from socket import socket, AF_UNIX, SOCK_STREAM
+
+import sys
+import json
+
+NEEDS_UPDATE = ("updated", "inserted")
+
+
+def request(socketPath, command, paths=()):
+    """Sends one request to a running 'seecr-license --serve' and returns
+    the response."""
+    with socket(AF_UNIX, SOCK_STREAM) as s:
+        s.connect(str(socketPath))
+        with s.makefile("rwb") as f:
+            f.write(
+                json.dumps(
+                    dict(command=command, paths=[abspath(p) for p in paths])
+                ).encode()
+                + b"\n"
+            )
+            f.flush()
+            line = f.readline()
+    if not line:
+        raise RuntimeError("No response from %s" % socketPath)
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(
+        description="Check or apply licenses through a running 'seecr-license --serve <socket>'."
+    )
+    parser.add_argument("socketPath", metavar="<socket>")
+    parser.add_argument("command", choices=["check", "apply", "shutdown"])
+    parser.add_argument(
+        "path",
+        metavar="<file|directory>",
+        nargs="*",
+        help="files or directories, '-' to read file names from stdin.",
+    )
+    args = parser.parse_args(args)
+
+    paths = []
+    for path in args.path:
+        if path == "-":
+            paths.extend(line.rstrip("\n") for line in sys.stdin if line.strip())
+        else:
+            paths.append(path)
+    try:
+        response = request(args.socketPath, args.command, paths)
+    except (OSError, RuntimeError) as e:
+        print(e)
+        return 2
+    failed = False
+    for entry in response["files"]:
+        if entry["outcome"] == "error":
+            failed = True
+            print("Error in %(path)s: %(error)s" % entry)
+        elif entry["outcome"] in NEEDS_UPDATE:
+            if args.command == "check":
+                failed = True
+                print("License needs updating in %(path)s" % entry)
+            else:
+                print("Updated %(path)s" % entry)
+    return 1 if failed else 0
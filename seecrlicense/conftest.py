@@ -0,0 +1,50 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import pytest
+
+from .applylicense import ApplyLicense
+
+
+@pytest.fixture
+def applyLicense():
+    """Makes an ApplyLicense for "Some Project" with CQ2 as copyright holder
+    in 2007, examining all files given. Other options are keyword
+    arguments."""
+
+    def applyLicense(**kwargs):
+        kwargs.setdefault("changedOnly", False)
+        return ApplyLicense(
+            ApplyLicense.Config(
+                {
+                    "project": "Some Project",
+                    "license": "arr",
+                    "copyrights": [
+                        {"name": "CQ2", "url": "http://cq2.nl"},
+                    ],
+                }
+            ),
+            year="2007",
+            **kwargs,
+        )
+
+    return applyLicense
@@ -22,54 +22,125 @@
 
 from io import StringIO
 from textwrap import TextWrapper
+from weakref import WeakValueDictionary
 
 
 class CopyrightSet(object):
+    """Immutable set of copyright holders. Holders are interned, so equal
+    sets share their holder records and compare, hash and merge in
+    O(holders)."""
+
+    __slots__ = ("_holders", "_hash")
+
     def __init__(self, copyrightDictList):
-        self._mergeEquallyNamed(copyrightDictList)
-
-    def _mergeEquallyNamed(self, copyrightDictList):
-        self._copyrights = {}
-        for c in copyrightDictList:
-            matchC = self._copyrights.get(c["name"])
-            if matchC is None:
-                self._copyrights[c["name"]] = cCopy = c.copy()
-                cCopy["years"] = set(c["years"])
-            else:
-                if max(c["years"]) >= max(matchC["years"]):
-                    matchC["url"] = c["url"]
-                    if "text" in c:
-                        matchC["text"] = c["text"]
-                    elif "text" in matchC:
-                        del matchC["text"]
-                matchC["years"].update(c["years"])
+        self._init(
+            _holder(c["name"], c["url"], c.get("text"), _yearsMask(c["years"]))
+            for c in copyrightDictList
+        )
+
+    def _init(self, holders):
+        byName = {}
+        for holder in holders:
+            match = byName.get(holder.name)
+            byName[holder.name] = holder if match is None else match.merge(holder)
+        self._holders = tuple(byName[name] for name in sorted(byName))
+        self._hash = hash(self._holders)
 
     def asCopyrightLines(self):
         s = StringIO()
-        for copyright in sorted(
-            list(self._copyrights.values()), key=lambda c: (min(c["years"]), c["name"])
-        ):
-            name = copyright["name"]
-            url = copyright["url"]
-            yearString = _serializeYears(copyright["years"])
+        for holder in sorted(self._holders, key=lambda h: (h.minYear(), h.name)):
+            name = holder.name
+            url = holder.url
+            yearString = _serializeYears(holder.yearList())
             s.write(copyrightLineTemplate % locals())
-            if copyright.get("text"):
-                s.write(_textWrapper.fill(copyright["text"]) + "\n")
+            if holder.text:
+                s.write(_textWrapper.fill(holder.text) + "\n")
         return s.getvalue()
 
     def merge(self, other):
-        return CopyrightSet(
-            list(self._copyrights.values()) + list(other._copyrights.values())
-        )
+        merged = CopyrightSet.__new__(CopyrightSet)
+        merged._init(self._holders + other._holders)
+        return merged
 
     def __str__(self):
         return self.asCopyrightLines()
 
     def __eq__(self, other):
-        return (
-            other.__class__ is self.__class__ and self._copyrights == other._copyrights
+        return other.__class__ is self.__class__ and self._holders == other._holders
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return _copyrightSetFromHolders, (self._holders,)
+
+
+class _Holder(object):
+    __slots__ = ("name", "url", "text", "years", "_hash", "__weakref__")
+
+    def __init__(self, name, url, text, years):
+        self.name = name
+        self.url = url
+        self.text = text
+        self.years = years
+        self._hash = hash((name, url, text, years))
+
+    def merge(self, other):
+        newest = other if other.maxYear() >= self.maxYear() else self
+        return _holder(self.name, newest.url, newest.text, self.years | other.years)
+
+    def minYear(self):
+        return (self.years & -self.years).bit_length() - 1
+
+    def maxYear(self):
+        return self.years.bit_length() - 1
+
+    def yearList(self):
+        years = self.years
+        result = []
+        while years:
+            lowest = years & -years
+            result.append(lowest.bit_length() - 1)
+            years ^= lowest
+        return result
+
+    def __eq__(self, other):
+        return self is other or (
+            other.__class__ is self.__class__
+            and (self.name, self.url, self.text, self.years)
+            == (other.name, other.url, other.text, other.years)
         )
 
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return _holder, (self.name, self.url, self.text, self.years)
+
+
+_interned = WeakValueDictionary()
+
+
+def _holder(name, url, text, years):
+    key = (name, url, text, years)
+    holder = _interned.get(key)
+    if holder is None:
+        holder = _interned[key] = _Holder(name, url, text, years)
+    return holder
+
+
+def _copyrightSetFromHolders(holders):
+    copyrightSet = CopyrightSet.__new__(CopyrightSet)
+    copyrightSet._init(holders)
+    return copyrightSet
+
+
+def _yearsMask(years):
+    mask = 0
+    for year in years:
+        mask |= 1 << int(year)
+    return mask
+
 
 def _serializeYears(years):
     intervals = []
@@ -21,6 +21,8 @@
 ## end license ##
 
 
+import pickle
+
 from .copyrightset import CopyrightSet, _serializeYears
 
 
@@ -202,3 +204,51 @@ Copyright (C) 2009-2011 Seecr http://seecr.nl\n\
 Copyright (C) 2015 Future Inc. http://future.url\n\
 "
     )
+
+
+def test_hash():
+    copyrightSet1 = CopyrightSet(
+        [
+            {"years": [2011, 2009], "name": "Seecr", "url": "http://seecr.nl"},
+            {"years": [2007], "name": "CQ2", "url": "http://cq2.nl", "text": "t"},
+        ]
+    )
+    copyrightSet2 = CopyrightSet(
+        [
+            {"years": [2007], "name": "CQ2", "url": "http://cq2.nl", "text": "t"},
+            {"years": [2009, 2011], "name": "Seecr", "url": "http://seecr.nl"},
+        ]
+    )
+    assert copyrightSet1 == copyrightSet2
+    assert hash(copyrightSet1) == hash(copyrightSet2)
+    assert len({copyrightSet1, copyrightSet2}) == 1
+
+
+def test_holders_are_interned():
+    copyrightSet1 = CopyrightSet(
+        [{"years": [2009, 2011], "name": "Seecr", "url": "http://seecr.nl"}]
+    )
+    copyrightSet2 = CopyrightSet(
+        [
+            {"years": [2011], "name": "Seecr", "url": "http://seecr.nl"},
+            {"years": [2009], "name": "Seecr", "url": "http://seecr.nl"},
+        ]
+    )
+    assert copyrightSet1._holders[0] is copyrightSet2._holders[0]
+    merged = copyrightSet1.merge(copyrightSet2)
+    assert merged == copyrightSet1
+    assert merged._holders[0] is copyrightSet1._holders[0]
+
+
+def test_pickle_keeps_interning():
+    copyrightSet = CopyrightSet(
+        [
+            {"years": [2009, 2011], "name": "Seecr", "url": "http://seecr.nl"},
+            {"years": [2007], "name": "CQ2", "url": "http://cq2.nl", "text": "t"},
+        ]
+    )
+    unpickled = pickle.loads(pickle.dumps(copyrightSet))
+    assert unpickled == copyrightSet
+    assert hash(unpickled) == hash(copyrightSet)
+    assert unpickled._holders[1] is copyrightSet._holders[1]
+    assert unpickled.asCopyrightLines() == copyrightSet.asCopyrightLines()
@@ -0,0 +1,182 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import environ, fsdecode, fsencode
+from os.path import join
+from shutil import rmtree
+from subprocess import Popen, PIPE
+from tempfile import mkdtemp
+
+from .report import UPDATED, INSERTED
+from .tools import _git, git_toplevel
+
+BLOB_MODES = (b"100644", b"100755")
+
+COMMIT_MESSAGE = "Update license headers"
+
+
+class CatFile(object):
+    """Reads objects through one long-lived 'git cat-file --batch'."""
+
+    def __init__(self, cwd=None):
+        self._proc = Popen(
+            ["git", "cat-file", "--batch"], cwd=cwd, stdin=PIPE, stdout=PIPE
+        )
+
+    def read(self, objectName):
+        self._proc.stdin.write(objectName + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline()
+        if not header or header.endswith(b" missing\n"):
+            raise RuntimeError("No such object: %s" % fsdecode(objectName))
+        size = int(header.split()[2])
+        data = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)
+        return data
+
+    def close(self):
+        self._proc.stdin.close()
+        self._proc.wait()
+        self._proc.stdout.close()
+
+
+class BlobWriter(object):
+    """Writes blobs through one long-lived 'git fast-import', which hands
+    back the object name of each blob as it is written."""
+
+    def __init__(self, cwd=None):
+        self._proc = Popen(
+            ["git", "fast-import", "--quiet", "--done"],
+            cwd=cwd,
+            stdin=PIPE,
+            stdout=PIPE,
+        )
+        self._mark = 0
+
+    def write(self, data):
+        self._mark += 1
+        stdin = self._proc.stdin
+        stdin.write(b"blob\nmark :%d\ndata %d\n" % (self._mark, len(data)))
+        stdin.write(data)
+        stdin.write(b"\nget-mark :%d\n" % self._mark)
+        stdin.flush()
+        return self._proc.stdout.readline().strip()
+
+    def close(self):
+        self._proc.stdin.write(b"done\n")
+        self._proc.stdin.close()
+        self._proc.stdout.close()
+        if self._proc.wait() != 0:
+            raise RuntimeError("'git fast-import' failed")
+
+
+def runOnGitObjects(applyLicense, paths, rev=None, cwd=None):
+    """Applies the license to the blobs in the index, or in the tree of rev,
+    without a checkout. Updated blobs are staged in the index, or for a rev
+    committed on top of it without moving any ref. Blobs are processed one
+    at a time, with the settings for where they would be checked out."""
+    root = git_toplevel(cwd)
+    applyLicense.loadHistoryYears(root, rev=rev)
+    entries = _entries(paths, rev, cwd)
+    catFile = CatFile(cwd=root)
+    writer = None
+    updates = []
+    runReport = applyLicense.runReport()
+
+    def results():
+        nonlocal writer
+        for mode, objectName, path in entries:
+            result = applyLicense.processBuffer(
+                path, catFile.read(objectName), filepath=join(root, path)
+            )
+            if result.outcome in (UPDATED, INSERTED) and not applyLicense.dryRun:
+                if writer is None:
+                    writer = BlobWriter(cwd=root)
+                updates.append((mode, writer.write(result.data), path))
+            result.data = None
+            yield result
+
+    try:
+        summary = applyLicense.profiled(
+            applyLicense.handleResults, results(), runReport
+        )
+    finally:
+        catFile.close()
+        if writer is not None:
+            writer.close()
+    applyLicense.save(runReport)
+    if updates:
+        indexInfo = b"".join(
+            b"%s %s\t%s\0" % (mode, objectName, fsencode(path))
+            for mode, objectName, path in updates
+        )
+        if rev is None:
+            _git(["update-index", "-z", "--index-info"], cwd=root, input=indexInfo)
+            print("Updated %d files in the index." % len(updates))
+        else:
+            summary["commit"] = _commitOnto(rev, indexInfo, root)
+            print("Committed %s on top of %s." % (summary["commit"], rev))
+    if applyLicense.check:
+        print("%(updated)d files need a license update." % summary)
+    else:
+        print(
+            "Examined %(examined)d files, updated %(updated)d, skipped %(skipped)d."
+            % summary
+        )
+    return summary
+
+
+def _entries(paths, rev, cwd):
+    if rev is None:
+        stdout = _git(["ls-files", "-s", "-z", "--full-name", "--", *paths], cwd=cwd)
+    else:
+        stdout = _git(
+            ["ls-tree", "-r", "-z", "--full-name", rev, "--", *paths], cwd=cwd
+        )
+    entries = []
+    for entry in stdout.split(b"\0"):
+        if not entry:
+            continue
+        info, path = entry.split(b"\t", 1)
+        if rev is None:
+            mode, objectName, stage = info.split()
+            if stage != b"0":
+                continue
+        else:
+            mode, objectType, objectName = info.split()
+        if mode in BLOB_MODES:
+            entries.append((mode, objectName, fsdecode(path)))
+    return entries
+
+
+def _commitOnto(rev, indexInfo, root):
+    tmpDir = mkdtemp(prefix="seecr-license-")
+    env = dict(environ, GIT_INDEX_FILE=join(tmpDir, "index"))
+    try:
+        _git(["read-tree", rev], cwd=root, env=env)
+        _git(["update-index", "-z", "--index-info"], cwd=root, input=indexInfo, env=env)
+        tree = fsdecode(_git(["write-tree"], cwd=root, env=env)).strip()
+    finally:
+        rmtree(tmpDir)
+    return fsdecode(
+        _git(["commit-tree", tree, "-p", rev, "-m", COMMIT_MESSAGE], cwd=root)
+    ).strip()
@@ -0,0 +1,128 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from hashlib import sha1
+from subprocess import run
+
+import json
+import pytest
+
+from .gitobjects import runOnGitObjects, CatFile, BlobWriter
+
+
+def git(repo, *args):
+    return run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.org", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    ).stdout.decode()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    (repo / "sub").mkdir(parents=True)
+    (repo / "a.py").write_text("# a\n")
+    (repo / "sub" / "b.sh").write_text("#!/bin/sh\necho b\n")
+    (repo / "image.png").write_bytes(b"\x89PNG\0")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Test")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "test@example.org")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "Test")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "test@example.org")
+    return repo
+
+
+def test_cat_file_and_blob_writer(repo):
+    catFile = CatFile(cwd=repo)
+    writer = BlobWriter(cwd=repo)
+    objectName = writer.write(b"new content\n")
+    writer.close()
+    assert objectName == sha1(b"blob 12\0new content\n").hexdigest().encode()
+    assert catFile.read(objectName) == b"new content\n"
+    with pytest.raises(RuntimeError, match="No such object"):
+        catFile.read(b"0" * 40)
+    catFile.close()
+
+
+def test_license_the_index(repo, capsys, applyLicense):
+    summary = runOnGitObjects(applyLicense(), ["."], cwd=repo)
+
+    assert summary["updated"] == 2
+    assert "Updated 2 files in the index." in capsys.readouterr().out
+    assert "2007 CQ2" in git(repo, "show", ":a.py")
+    assert git(repo, "show", ":sub/b.sh").startswith("#!/bin/sh\n## begin license")
+    assert (repo / "a.py").read_text() == "# a\n"
+    assert git(repo, "diff", "--cached", "--name-only").split() == [
+        "a.py",
+        "sub/b.sh",
+    ]
+
+
+def test_license_a_revision(repo, capsys, applyLicense):
+    head = git(repo, "rev-parse", "main").strip()
+
+    summary = runOnGitObjects(applyLicense(), ["sub"], rev="main", cwd=repo)
+
+    commit = summary["commit"]
+    assert git(repo, "rev-parse", "main").strip() == head
+    assert git(repo, "rev-parse", commit + "^").strip() == head
+    assert "2007 CQ2" in git(repo, "show", commit + ":sub/b.sh")
+    assert git(repo, "show", commit + ":a.py") == "# a\n"
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_check_writes_nothing(repo, capsys, applyLicense):
+    summary = runOnGitObjects(applyLicense(check=True), ["."], rev="main", cwd=repo)
+
+    assert summary["updated"] == 2
+    assert "commit" not in summary
+    assert "License needs updating in sub/b.sh" in capsys.readouterr().out
+    assert git(repo, "status", "--porcelain") == ""
+
+
+@pytest.mark.parametrize("rev", [None, "main"])
+def test_years_from_git(repo, tmp_path, monkeypatch, rev, applyLicense):
+    git(repo, "commit", "-q", "--amend", "--no-edit", "--date=2010-06-01T12:00:00")
+    monkeypatch.chdir(tmp_path)
+
+    summary = runOnGitObjects(applyLicense(yearsFromGit=True), ["."], rev=rev, cwd=repo)
+
+    blob = (summary["commit"] if rev else "") + ":a.py"
+    assert "Copyright (C) 2010 CQ2" in git(repo, "show", blob)
+
+
+def test_report(repo, tmp_path, applyLicense):
+    reportFile = tmp_path / "report.json"
+
+    runOnGitObjects(applyLicense(report="json", reportFile=reportFile), ["."], cwd=repo)
+
+    report = json.loads(reportFile.read_text())
+    assert report["totals"]["outcomes"] == {"inserted": 2, "skipped-unrecognized": 1}
+    assert sorted(entry["path"] for entry in report["files"]) == [
+        "a.py",
+        "image.png",
+        "sub/b.sh",
+    ]
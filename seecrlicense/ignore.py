@@ -0,0 +1,133 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os.path import join
+from re import compile, escape
+
+LICENSEIGNORE = ".licenseignore"
+GITATTRIBUTES = ".gitattributes"
+LINGUIST_ATTRIBUTES = ("linguist-generated", "linguist-vendored")
+
+
+class PathMatcher(object):
+    """Decides which paths below a root are excluded, from gitignore style
+    rules: later rules win, '!' re-includes, a trailing '/' only matches
+    directories, a '/' elsewhere anchors the pattern to the root and '**'
+    spans directories. Paths are relative to the root with '/' separators;
+    directories are given with a trailing '/'.
+
+    Consecutive rules with the same outcome are compiled into one pattern,
+    so a path costs one regular expression match per run of rules."""
+
+    def __init__(self, rules):
+        self._groups = []
+        for rule in rules:
+            rule = rule.strip()
+            if not rule or rule.startswith("#"):
+                continue
+            excluded = not rule.startswith("!")
+            pattern = _translate(rule if excluded else rule[1:])
+            if self._groups and self._groups[-1][0] == excluded:
+                self._groups[-1][1].append(pattern)
+            else:
+                self._groups.append((excluded, [pattern]))
+        self._groups = [
+            (excluded, compile("|".join(patterns)).match)
+            for excluded, patterns in reversed(self._groups)
+        ]
+
+    @classmethod
+    def forRoot(cls, root, defaults=(), exclude=(), include=()):
+        """Rules for a tree: the defaults, the linguist-generated and
+        linguist-vendored attributes from its .gitattributes, its
+        .licenseignore, the excludes and finally the includes."""
+        rules = list(defaults)
+        rules += _linguistRules(_readLines(join(root, GITATTRIBUTES)))
+        rules += _readLines(join(root, LICENSEIGNORE))
+        rules += exclude
+        rules += ["!" + pattern for pattern in include]
+        return cls(rules)
+
+    def excludes(self, path):
+        for excluded, match in self._groups:
+            if match(path):
+                return excluded
+        return False
+
+
+def _translate(rule):
+    dirOnly = rule.endswith("/")
+    rule = rule.rstrip("/")
+    anchored = "/" in rule
+    rule = rule.lstrip("/")
+    parts = []
+    i = 0
+    while i < len(rule):
+        if rule.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif rule.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif rule[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif rule[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif rule[i] == "[" and "]" in rule[i + 2 :]:
+            end = rule.index("]", i + 2)
+            charClass = rule[i + 1 : end].replace("\\", "\\\\")
+            if charClass.startswith("!"):
+                charClass = "^" + charClass[1:]
+            parts.append("[%s]" % charClass)
+            i = end + 1
+        else:
+            parts.append(escape(rule[i]))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    suffix = "/.*" if dirOnly else "(?:/.*)?"
+    return "(?:%s%s%s)$" % (prefix, "".join(parts), suffix)
+
+
+def _linguistRules(lines):
+    rules = []
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        pattern, attributes = fields[0], fields[1:]
+        for attribute in attributes:
+            name, _, value = attribute.partition("=")
+            if name.lstrip("-!") not in LINGUIST_ATTRIBUTES:
+                continue
+            unset = name.startswith(("-", "!")) or value == "false"
+            rules.append(("!" if unset else "") + pattern)
+    return rules
+
+
+def _readLines(path):
+    try:
+        with open(path) as f:
+            return f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
@@ -0,0 +1,95 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .ignore import PathMatcher
+
+
+def test_gitignore_style_rules():
+    matcher = PathMatcher(
+        [
+            "# comment",
+            "",
+            "*.min.js",
+            "build/",
+            "/docs",
+            "src/**/generated",
+            "!keep.min.js",
+            "data?.[ch]",
+        ]
+    )
+    assert matcher.excludes("app.min.js")
+    assert matcher.excludes("lib/app.min.js")
+    assert not matcher.excludes("lib/keep.min.js")
+    assert not matcher.excludes("app.js")
+
+    assert matcher.excludes("build/")
+    assert matcher.excludes("lib/build/")
+    assert matcher.excludes("build/out.py")
+    assert not matcher.excludes("build")
+
+    assert matcher.excludes("docs/")
+    assert matcher.excludes("docs/conf.py")
+    assert not matcher.excludes("lib/docs/")
+
+    assert matcher.excludes("src/generated/")
+    assert matcher.excludes("src/a/b/generated/x.py")
+    assert not matcher.excludes("lib/generated/")
+
+    assert matcher.excludes("data1.c")
+    assert not matcher.excludes("data12.c")
+    assert not matcher.excludes("data1.py")
+
+
+def test_later_rules_win():
+    matcher = PathMatcher(["*.py", "!*_test.py", "skip_test.py"])
+    assert matcher.excludes("a.py")
+    assert not matcher.excludes("a_test.py")
+    assert matcher.excludes("sub/skip_test.py")
+    assert len(matcher._groups) == 3
+
+
+def test_for_root(tmp_path):
+    (tmp_path / ".licenseignore").write_text("third_party/\n!third_party/\n*.gen.py\n")
+    (tmp_path / ".gitattributes").write_text(
+        "# attributes\n"
+        "*.js text\n"
+        "vendor/** linguist-vendored\n"
+        "api/*.pb.py linguist-generated=true\n"
+        "api/handwritten.pb.py -linguist-generated\n"
+        "static/*.css linguist-generated=false\n"
+    )
+    matcher = PathMatcher.forRoot(
+        tmp_path, defaults=[".git/"], exclude=["*.txt"], include=["notes.txt"]
+    )
+    assert matcher.excludes(".git/")
+    assert matcher.excludes("vendor/")
+    assert matcher.excludes("vendor/lib/x.js")
+    assert not matcher.excludes("app.js")
+    assert matcher.excludes("api/service.pb.py")
+    assert not matcher.excludes("api/handwritten.pb.py")
+    assert not matcher.excludes("static/site.css")
+    assert not matcher.excludes("third_party/")
+    assert matcher.excludes("x.gen.py")
+    assert matcher.excludes("readme.txt")
+    assert not matcher.excludes("notes.txt")
+
+    assert not PathMatcher.forRoot(tmp_path / "missing").excludes("x.py")
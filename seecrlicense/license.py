@@ -20,21 +20,29 @@
 #
 ## end license ##
 
+from .cache import fingerprint
+
 BEGIN_LICENSE_TEXT = "%s begin license %s\n"
 END_LICENSE_TEXT = "%s end license %s\n"
 
+MAX_RENDERED = 1024
+
 
 class License(object):
     def __init__(self, template, project=None, description=None):
         self._template = template
         self._project = project
         self._description = description
+        self._rendered = {}
 
     @classmethod
     def fromFile(cls, filePath, project=None, description=None):
         with open(filePath) as f:
             return License(f.read().strip(), project=project, description=description)
 
+    def fingerprint(self):
+        return fingerprint(self._template, self._project, self._description)
+
     def fill(self, copyrightLines):
         substitutionDict = dict(
             (key, value or "")
@@ -45,3 +53,21 @@ class License(object):
             ]
         )
         return "\n%s\n" % (self._template % substitutionDict).strip("\n")
+
+    def licenseBlock(self, licenseMarkers, copyrightSet):
+        """Returns the lines of the complete license block for the given
+        markers, including the blank line after it. Each distinct block is
+        rendered once and reused."""
+        key = (licenseMarkers, copyrightSet)
+        lines = self._rendered.get(key)
+        if lines is None:
+            if len(self._rendered) >= MAX_RENDERED:
+                self._rendered.clear()
+            startMarker, endMarker, lineMarker = licenseMarkers
+            appliedLicense = self.fill(copyrightLines=copyrightSet.asCopyrightLines())
+            lines = self._rendered[key] = tuple(
+                [startMarker]
+                + [(lineMarker + l).rstrip() for l in appliedLicense.split("\n")]
+                + [endMarker, ""]
+            )
+        return lines
@@ -21,6 +21,8 @@
 ## end license ##
 
 from .license import License
+from .copyrightset import CopyrightSet
+from .sourcefile import HASH_MARKERS, C_MARKERS
 
 
 def test_init_license():
@@ -81,3 +83,31 @@ All rights reserved.
 Copyright (C) 2009, 2011 Seecr http://seecr.nl
 """
     )
+
+
+def test_license_block_is_rendered_once():
+    l = License("%(copyrightlines)s", project="some project")
+    filled = []
+    fill = l.fill
+    l.fill = lambda **kwargs: filled.append(True) or fill(**kwargs)
+    copyrights = lambda: CopyrightSet(
+        [{"years": [2024], "name": "Seecr", "url": "https://seecr.nl"}]
+    )
+
+    block = l.licenseBlock(HASH_MARKERS, copyrights())
+    assert block == (
+        "## begin license ##",
+        "#",
+        "# Copyright (C) 2024 Seecr https://seecr.nl",
+        "#",
+        "## end license ##",
+        "",
+    )
+    assert l.licenseBlock(HASH_MARKERS, copyrights()) is block
+    assert len(filled) == 1
+    assert l.licenseBlock(C_MARKERS, copyrights())[:3] == (
+        "/* begin license *",
+        " *",
+        " * Copyright (C) 2024 Seecr https://seecr.nl",
+    )
+    assert len(filled) == 2
@@ -0,0 +1,91 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from cProfile import Profile
+from glob import glob
+from os import getpid, makedirs, remove
+from os.path import join, exists
+from pstats import Stats
+
+MAIN_PROFILE = "main.prof"
+WORKER_PROFILE = "worker-%d.prof"
+WORKER_PROFILES = "worker-*.prof"
+MERGED_PROFILE = "merged.prof"
+TOP_FUNCTIONS = 20
+
+
+class RunProfile(object):
+    """Profiles a run in the main process and merges that profile with the
+    ones the worker processes wrote to the same directory."""
+
+    def __init__(self, directory):
+        self._directory = str(directory)
+        makedirs(self._directory, exist_ok=True)
+        for path in self._ownProfiles() + [join(self._directory, MERGED_PROFILE)]:
+            if exists(path):
+                remove(path)
+        self._profile = Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._profile.dump_stats(join(self._directory, MAIN_PROFILE))
+
+    def merge(self):
+        paths = self._ownProfiles()
+        stats = Stats(*paths)
+        mergedPath = join(self._directory, MERGED_PROFILE)
+        stats.dump_stats(mergedPath)
+        print(
+            "Profiled %d processes, merged stats written to %s"
+            % (len(paths), mergedPath)
+        )
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        return stats
+
+    def _ownProfiles(self):
+        """The profiles a run writes, the only files in the directory it
+        removes beforehand or merges, besides the merged profile."""
+        return [join(self._directory, MAIN_PROFILE)] + sorted(
+            glob(join(self._directory, WORKER_PROFILES))
+        )
+
+
+def startWorkerProfile(directory):
+    """Profiles the current worker process until it exits."""
+    from multiprocessing.util import Finalize
+
+    profile = Profile()
+    Finalize(
+        None,
+        _dumpWorkerProfile,
+        args=(profile, str(directory)),
+        exitpriority=10,
+    )
+    profile.enable()
+
+
+def _dumpWorkerProfile(profile, directory):
+    profile.disable()
+    profile.dump_stats(join(directory, WORKER_PROFILE % getpid()))
@@ -0,0 +1,96 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from time import perf_counter
+
+import json
+
+UNCHANGED = "unchanged"
+UPDATED = "updated"
+INSERTED = "inserted"
+UNRECOGNIZED = "skipped-unrecognized"
+CACHED = "cached"
+ERROR = "error"
+
+PHASES = ("walk", "read", "parse", "merge", "render", "write")
+
+
+class FileResult(object):
+    def __init__(self, filepath, explicit, outcome=None):
+        self.filepath = filepath
+        self.explicit = explicit
+        self.outcome = outcome
+        self.state = None
+        self.timings = {}
+        self.error = None
+        self.data = None
+        self.staged = None
+
+
+class RunReport(object):
+    """Collects the outcome and per phase timings of every file in a run."""
+
+    def __init__(self):
+        self._started = perf_counter()
+        self._files = []
+        self._outcomes = {}
+        self._phases = dict.fromkeys(PHASES, 0.0)
+
+    def timedCandidates(self, candidates):
+        candidates = iter(candidates)
+        while True:
+            t0 = perf_counter()
+            try:
+                candidate = next(candidates)
+            except StopIteration:
+                return
+            finally:
+                self._phases["walk"] += perf_counter() - t0
+            yield candidate
+
+    def add(self, result):
+        entry = dict(
+            path=str(result.filepath), outcome=result.outcome, timings=result.timings
+        )
+        if result.error is not None:
+            entry["error"] = str(result.error)
+        self._files.append(entry)
+        self._outcomes[result.outcome] = self._outcomes.get(result.outcome, 0) + 1
+        for phase, duration in result.timings.items():
+            self._phases[phase] += duration
+
+    def asDict(self):
+        elapsed = perf_counter() - self._started
+        return dict(
+            files=self._files,
+            totals=dict(
+                files=len(self._files),
+                outcomes=self._outcomes,
+                phases=self._phases,
+                elapsed=elapsed,
+                filesPerSecond=len(self._files) / elapsed if elapsed else 0.0,
+            ),
+        )
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.asDict(), f, indent=2)
@@ -0,0 +1,67 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .report import RunReport, FileResult, PHASES, UPDATED, ERROR, CACHED
+
+import json
+
+
+def test_report(tmp_path):
+    report = RunReport()
+    assert list(report.timedCandidates(iter([("a.py", False), ("b.py", False)]))) == [
+        ("a.py", False),
+        ("b.py", False),
+    ]
+    updated = FileResult("a.py", False, UPDATED)
+    updated.timings = {"read": 0.5, "parse": 0.25, "write": 1.0}
+    report.add(updated)
+    failed = FileResult("b.py", False, ERROR)
+    failed.timings = {"read": 0.5}
+    failed.error = RuntimeError("broken")
+    report.add(failed)
+    report.add(FileResult("c.py", False, CACHED))
+
+    report.write(tmp_path / "report.json")
+    result = json.loads((tmp_path / "report.json").read_text())
+
+    assert result["files"] == [
+        {
+            "path": "a.py",
+            "outcome": "updated",
+            "timings": {"read": 0.5, "parse": 0.25, "write": 1.0},
+        },
+        {
+            "path": "b.py",
+            "outcome": "error",
+            "timings": {"read": 0.5},
+            "error": "broken",
+        },
+        {"path": "c.py", "outcome": "cached", "timings": {}},
+    ]
+    totals = result["totals"]
+    assert totals["files"] == 3
+    assert totals["outcomes"] == {"updated": 1, "error": 1, "cached": 1}
+    assert set(totals["phases"]) == set(PHASES)
+    assert totals["phases"]["read"] == 1.0
+    assert totals["phases"]["walk"] > 0
+    assert totals["elapsed"] > 0
+    assert totals["filesPerSecond"] > 0
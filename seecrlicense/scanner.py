@@ -0,0 +1,134 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from re import compile, escape, MULTILINE
+
+BEGIN_WITHOUT_END = "'begin license' marker found without matching 'end license'"
+END_WITHOUT_BEGIN = "'end license' marker found without matching 'begin license'"
+
+_trailing = rb"[ \t\r\f\v]*"
+_blankLineRe = compile(_trailing + rb"(?=\n|\Z)")
+_nextBlankLineRe = compile(rb"\n" + _trailing + rb"(?=\n|\Z)")
+
+
+class LicenseBlock(object):
+    """Byte range [start, stop) of a license block in scanned data, spanning
+    whole lines without the final newline. If insert is set, no lines are
+    replaced and a new block goes in at start."""
+
+    __slots__ = ("start", "stop", "found", "insert", "licenseLines", "error")
+
+    def __init__(self):
+        self.start = self.stop = 0
+        self.found = False
+        self.insert = False
+        self.licenseLines = []
+        self.error = None
+
+
+class LicenseScanner(object):
+    """Finds the license block of one marker style in raw bytes, with
+    precompiled patterns, in a single pass over the data. The data may be
+    any buffer with find and rfind, such as an mmap, of which only the part
+    before end is looked at."""
+
+    def __init__(self, licenseMarkers):
+        startMarker, endMarker, lineMarker = (m.encode() for m in licenseMarkers)
+        self._startRe = compile(
+            rb"^%s%s$" % (escape(startMarker), _trailing), MULTILINE
+        )
+        self._endRe = compile(rb"^%s%s$" % (escape(endMarker), _trailing), MULTILINE)
+        self._copyrightRe = compile(
+            rb"^.{%d}%sCopyright \(C\)" % (len(lineMarker), _trailing), MULTILINE
+        )
+        self._lineMarkerLength = len(licenseMarkers[2])
+
+    def scan(self, data, end=None):
+        end = len(data) if end is None else end
+        block = LicenseBlock()
+        endMatch = self._endRe.search(data, 0, end)
+        startMatch = self._startRe.search(
+            data, 0, end if endMatch is None else endMatch.start()
+        )
+        if endMatch is None:
+            if startMatch is not None:
+                block.error = BEGIN_WITHOUT_END
+                return block
+            return self._insertionPoint(data, end, block)
+        if startMatch is None:
+            block.error = END_WITHOUT_BEGIN
+            return block
+
+        block.found = True
+        block.start = startMatch.start()
+        block.stop = endMatch.end()
+        blankLine = _nextBlankLineRe.match(data, block.stop, end)
+        if blankLine is not None:
+            block.stop = blankLine.end()
+            bodyStop = endMatch.start()
+        else:
+            bodyStop = data.rfind(b"\n", 0, endMatch.start() - 1) + 1
+        bodyStart = _nextLine(data, _nextLine(data, block.start, end), end)
+        if bodyStart < bodyStop:
+            copyrightMatch = self._copyrightRe.search(data, bodyStart, bodyStop)
+            if copyrightMatch is not None:
+                block.licenseLines = [
+                    line.decode("utf-8")[self._lineMarkerLength :]
+                    for line in data[copyrightMatch.start() : bodyStop - 1].split(
+                        b"\n"
+                    )
+                ]
+        return block
+
+    def hasMarker(self, data, start=0, end=None):
+        """Whether a begin or end marker line occurs in data between start
+        and end, where start is at the beginning of a line."""
+        end = len(data) if end is None else end
+        return (
+            self._startRe.search(data, start, end) is not None
+            or self._endRe.search(data, start, end) is not None
+        )
+
+    def _insertionPoint(self, data, end, block):
+        position = 0
+        if data[: min(end, 5)].startswith((b"#!", b"<?php")):
+            position = _nextLine(data, position, end)
+        if _isEncodingLine(data, position, end):
+            position = _nextLine(data, position, end)
+        block.start = block.stop = position
+        blankLine = _blankLineRe.match(data, position, end)
+        if blankLine is not None:
+            block.stop = blankLine.end()
+        else:
+            block.insert = True
+        return block
+
+
+def _nextLine(data, position, end):
+    newline = data.find(b"\n", position, end)
+    return end if newline < 0 else newline + 1
+
+
+def _isEncodingLine(data, position, end):
+    """See http://www.python.org/dev/peps/pep-0263"""
+    line = data[position : _nextLine(data, position, end)]
+    return line.startswith(b"#") and (b"coding:" in line or b"coding=" in line)
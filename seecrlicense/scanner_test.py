@@ -0,0 +1,104 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .scanner import LicenseScanner, BEGIN_WITHOUT_END, END_WITHOUT_BEGIN
+from .sourcefile import HASH_MARKERS, C_MARKERS
+
+hashScanner = LicenseScanner(HASH_MARKERS)
+
+
+def test_scan_license_block():
+    data = b"""#!/usr/bin/env python
+
+## begin license ##
+#
+# Copyright (C) 2010 Seecr https://seecr.nl
+#     some text
+# Copyright (C) 2011 CQ2 http://cq2.nl
+#
+# This is not a copyright line
+#
+## end license ##  
+
+def code(here): pass"""
+    block = hashScanner.scan(data)
+    assert block.found
+    assert not block.insert
+    assert data[block.start : block.stop].startswith(b"## begin license ##\n")
+    assert data[block.stop :] == b"\ndef code(here): pass"
+    assert block.licenseLines == [
+        "Copyright (C) 2010 Seecr https://seecr.nl",
+        "    some text",
+        "Copyright (C) 2011 CQ2 http://cq2.nl",
+        "",
+        "This is not a copyright line",
+        "",
+    ]
+
+
+def test_scan_c_markers():
+    data = (
+        b"/* begin license *\n *\n * Copyright (C) 2010 S https://s\n *\n"
+        b" * end license */\nint i;"
+    )
+    block = LicenseScanner(C_MARKERS).scan(data)
+    assert (block.start, block.stop) == (0, len(data) - len(b"\nint i;"))
+    assert block.licenseLines == ["Copyright (C) 2010 S https://s"]
+    assert not hashScanner.scan(data).found
+
+
+def test_scan_insertion_point():
+    block = hashScanner.scan(b"code()")
+    assert (block.found, block.insert, block.start, block.stop) == (False, True, 0, 0)
+
+    data = b"#!/bin/sh\n# -*- coding: utf-8 -*-\n   \ncode"
+    block = hashScanner.scan(data)
+    assert not block.insert
+    assert data[block.start : block.stop] == b"   "
+
+    block = hashScanner.scan(b"<?php\n?>")
+    assert (block.insert, block.start) == (True, 6)
+
+
+def test_scan_unmatched_markers():
+    assert hashScanner.scan(b"## begin license ##\n#\n").error == BEGIN_WITHOUT_END
+    assert hashScanner.scan(b"#\n## end license ##\n").error == END_WITHOUT_BEGIN
+    assert (
+        hashScanner.scan(b"## end license ##\n## begin license ##\n").error
+        == END_WITHOUT_BEGIN
+    )
+
+
+def test_scan_stops_at_end():
+    data = b"#!/bin/sh\n## begin license ##\n#\n## end license ##\necho\n"
+    block = hashScanner.scan(data, end=len(b"#!/bin/sh\n## begin license ##"))
+    assert block.error == BEGIN_WITHOUT_END
+
+    for end in range(len(data)):
+        bounded, truncated = hashScanner.scan(data, end), hashScanner.scan(data[:end])
+        assert [getattr(bounded, name) for name in bounded.__slots__] == [
+            getattr(truncated, name) for name in truncated.__slots__
+        ]
+
+    block = hashScanner.scan(data, end=len(data) - len(b"echo\n"))
+    assert block.found
+    assert data[block.stop :] == b"echo\n"
@@ -0,0 +1,117 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import unlink
+from os.path import exists
+from socketserver import UnixStreamServer, StreamRequestHandler
+
+import json
+
+from .report import UPDATED, INSERTED
+from .writer import WriteBatch
+
+CHECK = "check"
+APPLY = "apply"
+SHUTDOWN = "shutdown"
+
+
+class LicenseServer(UnixStreamServer):
+    """Answers check and apply requests for paths on a Unix socket, keeping
+    the config, the rendered license blocks and the file states of an
+    ApplyLicense in memory between requests. The file states are kept by
+    its cache, one made with memoryCache=True or with a cache file.
+
+    Requests and responses are JSON objects, one per line:
+
+        {"command": "check", "paths": ["/abs/path/file.py", "/abs/dir"]}
+        {"files": [{"path": "/abs/path/file.py", "outcome": "updated"}]}
+
+    Requests are handled one at a time."""
+
+    def __init__(self, socketPath, applyLicense):
+        self.applyLicense = applyLicense
+        applyLicense.loadHistoryYears()
+        self._socketPath = str(socketPath)
+        self._stopped = False
+        if exists(self._socketPath):
+            unlink(self._socketPath)
+        UnixStreamServer.__init__(self, self._socketPath, _RequestHandler)
+
+    def serve(self):
+        print("Serving on %s" % self._socketPath)
+        try:
+            while not self._stopped:
+                self.handle_request()
+        finally:
+            self.close()
+
+    def close(self):
+        self.server_close()
+        if exists(self._socketPath):
+            unlink(self._socketPath)
+
+    def answer(self, request):
+        command = request.get("command")
+        if command == SHUTDOWN:
+            self._stopped = True
+            return dict(files=[])
+        if command not in (CHECK, APPLY):
+            return dict(error="Unknown command: %r" % (command,))
+        paths = [path for path in request.get("paths", []) if path != "-"]
+        applyLicense = self.applyLicense
+        files = []
+        dryRun = command == CHECK or applyLicense.dryRun
+        writeBatch = WriteBatch(applyLicense.writeStrategy)
+        try:
+            for filepath, explicit in applyLicense.candidates(paths):
+                result = applyLicense.processFile(filepath, explicit, dryRun=dryRun)
+                if not dryRun and result.outcome in (UPDATED, INSERTED):
+                    writeBatch.add(result)
+                applyLicense.record(result)
+                entry = dict(path=str(filepath), outcome=result.outcome)
+                if result.error is not None:
+                    entry["error"] = str(result.error)
+                files.append(entry)
+        finally:
+            writeBatch.finish()
+        applyLicense.save()
+        return dict(files=files)
+
+
+class _RequestHandler(StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Expected a JSON object")
+            except ValueError as e:
+                response = dict(error="Invalid request: %s" % e)
+            else:
+                try:
+                    response = self.server.answer(request)
+                except Exception as e:
+                    response = dict(error="Request failed: %s" % e)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if self.server._stopped:
+                return
@@ -0,0 +1,132 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import environ
+from subprocess import run
+from threading import Thread
+
+import pytest
+
+from .applylicense import ApplyLicense
+from .server import LicenseServer
+from .client import request, main
+
+
+@pytest.fixture
+def startServer(tmp_path_factory, applyLicense):
+    started = []
+
+    def startServer(**kwargs):
+        socketPath = tmp_path_factory.mktemp("server") / "license.sock"
+        server = LicenseServer(socketPath, applyLicense(memoryCache=True, **kwargs))
+        thread = Thread(target=server.serve)
+        thread.start()
+        started.append((socketPath, thread))
+        return socketPath
+
+    yield startServer
+    for socketPath, thread in started:
+        request(socketPath, "shutdown")
+        thread.join()
+        assert not socketPath.exists()
+
+
+@pytest.fixture
+def server(startServer):
+    return startServer()
+
+
+def test_check_and_apply(tmp_path, server, capsys):
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+
+    assert request(server, "check", [sourceFile]) == {
+        "files": [{"path": str(sourceFile), "outcome": "inserted"}]
+    }
+    assert sourceFile.read_text() == "# stuff"
+
+    assert main([str(server), "check", str(sourceFile)]) == 1
+    assert "License needs updating in %s" % sourceFile in capsys.readouterr().out
+
+    assert main([str(server), "apply", str(tmp_path)]) == 0
+    assert "Updated %s" % sourceFile in capsys.readouterr().out
+    assert "2007 CQ2" in sourceFile.read_text()
+
+    assert request(server, "check", [sourceFile]) == {
+        "files": [{"path": str(sourceFile), "outcome": "cached"}]
+    }
+    assert main([str(server), "check", str(sourceFile)]) == 0
+
+
+def test_bad_requests(server):
+    with pytest.raises(RuntimeError, match="Unknown command: 'remove'"):
+        request(server, "remove", [])
+    assert main([str(server), "check", "does-not-exist.py"]) == 0
+
+
+def test_no_server(tmp_path, capsys):
+    assert main([str(tmp_path / "missing.sock"), "check", "x.py"]) == 2
+
+
+@pytest.fixture
+def repo2010(tmp_path, monkeypatch):
+    sourceFile = tmp_path / "old.py"
+    sourceFile.write_text("# old")
+    for args in [["init", "-q"], ["add", "."], ["commit", "-q", "-m", "old"]]:
+        run(
+            ["git", "-c", "user.name=T", "-c", "user.email=t@example.org", *args],
+            cwd=tmp_path,
+            check=True,
+            env=dict(environ, GIT_AUTHOR_DATE="2010-06-01T12:00:00"),
+        )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_years_from_git(repo2010, startServer):
+    server = startServer(yearsFromGit=True)
+    sourceFile = repo2010 / "old.py"
+    assert request(server, "apply", [sourceFile])["files"][0]["outcome"] == "inserted"
+    assert "Copyright (C) 2010 CQ2" in sourceFile.read_text()
+
+
+def test_dry_run_server_does_not_write(tmp_path, startServer):
+    server = startServer(dryRun=True)
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+
+    assert request(server, "apply", [sourceFile])["files"][0]["outcome"] == "inserted"
+    assert sourceFile.read_text() == "# stuff"
+
+
+def test_failing_request_is_answered(tmp_path, server, monkeypatch):
+    def processFile(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(ApplyLicense, "processFile", processFile)
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+
+    with pytest.raises(RuntimeError, match="Request failed: boom"):
+        request(server, "apply", [sourceFile])
+    monkeypatch.undo()
+    assert request(server, "check", [sourceFile])["files"][0]["outcome"] == "inserted"
@@ -21,12 +21,15 @@
 ## end license ##
 
 
-from os import rename
+from os import rename, fstat, fsync as _fsync
+from mmap import mmap, ACCESS_READ
 from os.path import abspath, splitext, basename
-from shutil import copystat
 from re import compile, DOTALL
+from codecs import getincrementaldecoder
+from time import perf_counter
 
 from .copyrightset import CopyrightSet
+from .scanner import LicenseScanner, BEGIN_WITHOUT_END
 
 
 HASH_MARKERS = ("## begin license ##", "## end license ##", "# ")
@@ -50,23 +53,37 @@ markersByExtension = {
 }
 markersByFilename = {"Makefile": HASH_MARKERS}
 
+_scanners = {
+    markers: LicenseScanner(markers)
+    for markers in (HASH_MARKERS, C_MARKERS, J2_MARKERS)
+}
+
+HEAD_SIZE = 64 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 16 * HEAD_SIZE
+
 
 def _licenseMarkersForType(filename):
     ignored, fileExt = splitext(filename)
     return markersByExtension.get(fileExt) or markersByFilename.get(basename(filename))
 
 
-def _licenseMarkersFromContent(filename):
-    with open(filename, "rb") as f:
-        try:
-            for i, line in enumerate(f):
-                if i > 5:
-                    break
-                if line.startswith(b"#!"):
-                    return HASH_MARKERS
-        except UnicodeDecodeError:
-            print("Error in: " + filename)
-            raise
+def _licenseMarkersFromContent(prefix):
+    for line in prefix.split(b"\n", 6)[:6]:
+        if line.startswith(b"#!"):
+            return HASH_MARKERS
+
+
+def _looksBinary(prefix, complete):
+    """NUL bytes or invalid UTF-8 in the first bytes of a file; a character
+    cut off at the end of an incomplete prefix is not held against it."""
+    if b"\0" in prefix:
+        return True
+    try:
+        getincrementaldecoder("utf-8")().decode(prefix, complete)
+    except UnicodeDecodeError:
+        return True
+    return False
 
 
 class UnrecognizedFileType(Exception):
@@ -74,57 +91,221 @@ class UnrecognizedFileType(Exception):
 
 
 class SourceFile(object):
-    def __init__(self, filename):
+    """A source file on disk, or in memory when its content is given as data.
+    An in memory SourceFile is never written, licensedHead() returns the
+    complete new content instead."""
+
+    def __init__(self, filename, headSize=HEAD_SIZE, data=None):
+        t0 = perf_counter()
+        self.timings = {}
+        self._map = None
+        if data is not None:
+            self._filename = filename
+            self._classify(filename, data[:HEAD_SIZE], len(data) <= HEAD_SIZE)
+            self._setHead(data, None)
+        else:
+            self._filename = abspath(filename)
+            with open(filename, "rb") as f:
+                prefix = f.read(-1 if headSize is None else headSize)
+                self._classify(
+                    filename, prefix, headSize is None or len(prefix) < headSize
+                )
+                self._readHead(f, prefix, headSize)
+        self.timings["read"] = perf_counter() - t0
+
+    def _classify(self, filename, prefix, complete):
+        """Picks the license markers by name, or by a #! in the first lines
+        of the prefix, and rejects binary content before it is parsed."""
         self.licenseMarkers = _licenseMarkersForType(
             filename
-        ) or _licenseMarkersFromContent(filename)
-        if self.licenseMarkers is None:
+        ) or _licenseMarkersFromContent(prefix)
+        if self.licenseMarkers is None or _looksBinary(prefix, complete):
             raise UnrecognizedFileType(
                 "%s is not recognized as a source file." % filename
             )
         self.licenseStartMarker, self.licenseEndMarker, self.licenseLineMarker = (
             self.licenseMarkers
         )
-        self._filename = abspath(filename)
-        with open(filename) as f:
-            self._lines = f.read().split("\n")
+
+    def _readHead(self, f, data, headSize):
+        """Reads only as many lines as needed to find the license block,
+        continuing from what was read already. The remainder is left on disk
+        and is only copied when rewriting. Large files are mapped instead,
+        and searched in place."""
+        if headSize is not None and fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            self._mapHead(f, headSize)
+            return
+        while headSize is not None and len(data) == headSize:
+            tailOffset = data.rfind(b"\n")
+            if tailOffset >= 0:
+                self._setHead(data[:tailOffset], tailOffset)
+                if self._headIsSufficient(f):
+                    return
+            data += f.read(headSize)
+            headSize *= 2
+        self._setHead(data, None)
+
+    def _mapHead(self, f, headSize):
+        self._map = mmap(f.fileno(), 0, access=ACCESS_READ)
+        size = len(self._map)
+        while headSize < size:
+            tailOffset = self._map.rfind(b"\n", 0, headSize)
+            if tailOffset >= 0:
+                self._setHead(self._map, tailOffset, end=tailOffset)
+                if self._headIsSufficient(f):
+                    return
+            headSize *= 2
+        self._setHead(self._map, None)
+
+    def _setHead(self, data, tailOffset, end=None):
+        self._headEnd = len(data) if end is None else end
+        with memoryview(data) as view:
+            str(view[: self._headEnd], "utf-8")
+        self._head = data
+        self._tailOffset = tailOffset
+        self._block = _scanners[self.licenseMarkers].scan(data, self._headEnd)
+
+    def _headIsSufficient(self, f):
+        if self._tailOffset is None:
+            return True
+        position = 0
+        for _ in range(3):
+            position = self._head.find(b"\n", position, self._headEnd) + 1
+            if position == 0:
+                return False
+        if self._block.error == BEGIN_WITHOUT_END:
+            return False
+        if not self._block.found:
+            return not self._markerAfterHead(f)
+        return self._block.stop < self._headEnd
+
+    def _markerAfterHead(self, f):
+        """Whether a begin or end marker follows the head, so that the
+        license block, or a broken one, lies beyond it. Searched in place
+        when mapped, otherwise in chunks that are not kept."""
+        scanner = _scanners[self.licenseMarkers]
+        if self._map is not None:
+            return scanner.hasMarker(self._map, self._tailOffset)
+        position = f.tell()
+        f.seek(self._tailOffset)
+        try:
+            rest = b""
+            while True:
+                chunk = f.read(COPY_CHUNK_SIZE)
+                rest += chunk
+                stop = rest.rfind(b"\n") + 1 if chunk else len(rest)
+                if scanner.hasMarker(rest, 0, stop):
+                    return True
+                if not chunk:
+                    return False
+                rest = rest[stop:]
+        finally:
+            f.seek(position)
+
+    def licenseRegion(self):
+        """The bytes of the license block, or of the insertion point, as a
+        memoryview on the data that was read or mapped, without copying."""
+        block = self._licenseBlock()
+        return memoryview(self._head)[block.start : block.stop]
+
+    def close(self):
+        """Unmaps a mapped file. Fails with BufferError while a memoryview
+        returned by licenseRegion() is still in use."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
 
     def maybeUpdateLicense(
         self, license, configuredCopyrightSet, forceUpdate=False, dryRun=False
     ):
+        mergedCopyrightSet = self.mergedCopyrightSet(
+            configuredCopyrightSet, forceUpdate=forceUpdate
+        )
+        if mergedCopyrightSet is None:
+            return False
+        self._updateLicense(license, mergedCopyrightSet, dryRun)
+        return True
+
+    def mergedCopyrightSet(self, configuredCopyrightSet, forceUpdate=False):
+        """Returns the CopyrightSet the license should be updated with, or None
+        if the license is already up to date."""
+        t0 = perf_counter()
         copyrightLines = self._parseCopyrightLines()
+        t1 = perf_counter()
         currentCopyrightSet = CopyrightSet(copyrightLines)
         mergedCopyrightSet = currentCopyrightSet.merge(configuredCopyrightSet)
-        if mergedCopyrightSet != currentCopyrightSet or forceUpdate:
-            self._updateLicense(license, mergedCopyrightSet, dryRun)
+        updateNeeded = mergedCopyrightSet != currentCopyrightSet or forceUpdate
+        self.timings["parse"] = t1 - t0
+        self.timings["merge"] = perf_counter() - t1
+        return mergedCopyrightSet if updateNeeded else None
+
+    def hasLicense(self):
+        return self._block.found
 
     def _updateLicense(self, license, copyrightSet, dryRun=False):
         if not dryRun:
-            template = "\n".join(
-                [self.licenseStartMarker, "%s", self.licenseEndMarker, ""]
-            )
+            self._write(self.licensedHead(license, copyrightSet))
 
-            appliedLicense = license.fill(
-                copyrightLines=copyrightSet.asCopyrightLines()
-            )
-            contents = "\n".join(
-                self.licenseLineMarker + l for l in appliedLicense.split("\n")
-            )
-            formattedLines = (l.rstrip() for l in (template % contents).split("\n"))
+    def licensedHead(self, license, copyrightSet):
+        """Returns the head of the file with the license block replaced or
+        inserted, spliced in by byte range."""
+        t0 = perf_counter()
+        block = self._licenseBlock()
+        cr = self._carriageReturn(block)
+        lines = license.licenseBlock(self.licenseMarkers, copyrightSet)
+        text = "\n".join(line + cr for line in lines).encode("utf-8")
+        if block.insert:
+            text += b"\n"
+        if block.start and self._head[block.start - 1 : block.start] != b"\n":
+            text = cr.encode() + b"\n" + text
+        newHead = (
+            self._head[: block.start] + text + self._head[block.stop : self._headEnd]
+        )
+        self.timings["render"] = perf_counter() - t0
+        return newHead
+
+    def _carriageReturn(self, block):
+        """A carriage return to end each line of the new block with if the
+        file has CRLF line endings, judged by the line the license block
+        starts on, or the first line when there is no block yet."""
+        start = block.start if block.found else 0
+        newline = self._head.find(b"\n", start, self._headEnd)
+        return "\r" if newline > 0 and self._head[newline - 1] == 0x0D else ""
 
-            startMarkerIndex, endMarkerIndex = self.findMarkerIndexes()
-            newLines = self._lines[:]
-            newLines[startMarkerIndex : endMarkerIndex + 1] = formattedLines
-            self._write(newLines)
-        print("Updated %s" % self._filename)
+    def _write(self, newHead, fsync=False):
+        t0 = perf_counter()
+        tmpFileName = self._writeTemp(newHead, fsync)
+        try:
+            self.close()
+        except BufferError:
+            self._map = None
+        rename(tmpFileName, self._filename)
+        self._head = newHead
+        self._headEnd = len(newHead)
+        self._block = _scanners[self.licenseMarkers].scan(newHead)
+        if self._tailOffset is not None:
+            self._tailOffset = len(newHead)
+        self.timings["write"] = perf_counter() - t0
 
-    def _write(self, newLines):
+    def _writeTemp(self, newHead, fsync=False):
+        """Writes the new content next to the file and returns the name of
+        that temporary file, leaving the rename to the caller."""
+        t0 = perf_counter()
         tmpFileName = self._filename + ".tmp"
-        with open(tmpFileName, "w") as tmpFile:
+        with open(tmpFileName, "wb") as tmpFile:
+            from shutil import copystat
+
             copystat(self._filename, tmpFileName)
-            tmpFile.write("\n".join(newLines))
-        rename(tmpFileName, self._filename)
-        self._lines = newLines
+            tmpFile.write(newHead)
+            if self._tailOffset is not None:
+                with open(self._filename, "rb") as f:
+                    f.seek(self._tailOffset)
+                    _copyTail(f, tmpFile)
+            if fsync:
+                tmpFile.flush()
+                _fsync(tmpFile.fileno())
+        self.timings["write"] = perf_counter() - t0
+        return tmpFileName
 
     def _parseCopyrightLines(self):
         copyrightIndent = 0
@@ -143,15 +324,7 @@ class SourceFile(object):
         return [self._parseCopyrightLine(crl) for crl in copyrightLines]
 
     def _readLicenseLines(self):
-        startMarkerIndex, endMarkerIndex = self.findMarkerIndexes()
-        licenseLines = []
-        if startMarkerIndex != endMarkerIndex:
-            lineMarkerLength = len(self.licenseLineMarker)
-            licenseLines = [
-                line[lineMarkerLength:]
-                for line in self._lines[startMarkerIndex + 2 : endMarkerIndex - 1]
-            ]
-        return licenseLines
+        return self._licenseBlock().licenseLines
 
     def _parseCopyrightLine(self, line):
         m = _copyrightLineRe.match(line)
@@ -169,53 +342,47 @@ class SourceFile(object):
         return copyrightAttributes
 
     def findMarkerIndexes(self):
-        startMarkerIndex = -1
-        endMarkerIndex = -1
-        for index, line in enumerate(self._lines):
-            line = line.rstrip()
-            if startMarkerIndex < 0:
-                if line == self.licenseStartMarker:
-                    startMarkerIndex = index
-            if line == self.licenseEndMarker:
-                endMarkerIndex = index
-                try:
-                    if self._lines[index + 1].strip() == "":
-                        endMarkerIndex = index + 1
-                except IndexError:
-                    pass
-                break
-
-        if startMarkerIndex < 0:
-            if endMarkerIndex < 0:
-                return self._findInsertionPoint()
-            raise RuntimeError(
-                "'end license' marker found without matching 'begin license' in file %s"
-                % self._filename
-            )
-        elif endMarkerIndex < 0:
-            raise RuntimeError(
-                "'begin license' marker found without matching 'end license' in file %s"
-                % self._filename
-            )
+        block = self._licenseBlock()
+        startMarkerIndex = self._head[: block.start].count(b"\n")
+        if block.insert:
+            return (startMarkerIndex, startMarkerIndex - 1)
+        return (startMarkerIndex, self._head[: block.stop].count(b"\n"))
+
+    def _licenseBlock(self):
+        if self._block.error is not None:
+            raise RuntimeError("%s in file %s" % (self._block.error, self._filename))
+        return self._block
+
+
+def _copyTail(src, dst):
+    """Copies the rest of src to dst in fixed size chunks, in kernel space
+    when the platform and filesystem allow it."""
+    dst.flush()
+    try:
+        from os import copy_file_range
+    except ImportError:
+        copy_file_range = None
+    if copy_file_range is not None:
+        start = offset = src.tell()
+        end = fstat(src.fileno()).st_size
+        try:
+            while offset < end:
+                copied = copy_file_range(
+                    src.fileno(),
+                    dst.fileno(),
+                    min(end - offset, COPY_CHUNK_SIZE),
+                    offset,
+                )
+                if copied == 0:
+                    break
+                offset += copied
+            return
+        except OSError:
+            if offset != start:
+                raise
+    from shutil import copyfileobj
 
-        return (startMarkerIndex, endMarkerIndex)
-
-    def _findInsertionPoint(self):
-        insertionPoint = 0
-        line = self._lines[insertionPoint]
-        if line.startswith("#!") or line.startswith("<?php"):
-            insertionPoint += 1
-        line = self._lines[insertionPoint]
-        if self._isEncodingLine(line):
-            insertionPoint += 1
-        insertionPointEnd = insertionPoint
-        if self._lines[insertionPointEnd].strip() == "":
-            insertionPointEnd += 1
-        return (insertionPoint, insertionPointEnd - 1)
-
-    def _isEncodingLine(self, line):
-        """See http://www.python.org/dev/peps/pep-0263"""
-        return line.startswith("#") and ("coding:" in line or "coding=" in line)
+    copyfileobj(src, dst, COPY_CHUNK_SIZE)
 
 
 _yearPart = r"(?P<years>\d{4}((-|,\s*)\d{4})*)"
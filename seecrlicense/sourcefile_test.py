@@ -81,6 +81,38 @@ def test_binary_file(tmp_path):
     pytest.raises(UnrecognizedFileType, SourceFile, fp)
 
 
+def test_binary_content_is_rejected_early(tmp_path):
+    for name, content in [
+        ("compiled.py", b"# header\n\0\x01\x02"),
+        ("latin1.js", "/* caf\xe9 */\n".encode("latin-1")),
+        ("tool", b"#!/bin/sh\n\0ELF"),
+    ]:
+        fp = tmp_path / name
+        fp.write_bytes(content)
+        pytest.raises(UnrecognizedFileType, SourceFile, fp)
+        pytest.raises(UnrecognizedFileType, SourceFile, name, data=content)
+
+
+def test_character_cut_off_by_prefix_is_not_binary(tmp_path):
+    fp = tmp_path / "file.py"
+    fp.write_bytes(b"#" * 1023 + "\u20ac\n".encode() + b"# more\n" * 10)
+    assert SourceFile(fp, headSize=1024).findMarkerIndexes() == (0, -1)
+
+
+def test_file_is_opened_once(tmp_path, monkeypatch):
+    fp = tmp_path / "start-script"
+    fp.write_text("#!/bin/bash\n" + "echo hello\n" * 500)
+    opened = []
+    realOpen = open
+    monkeypatch.setattr(
+        "builtins.open", lambda *args: opened.append(args) or realOpen(*args)
+    )
+    sourceFile = SourceFile(fp, headSize=256)
+    assert sourceFile.licenseMarkers == HASH_MARKERS
+    assert sourceFile.findMarkerIndexes() == (1, 0)
+    assert opened == [(fp, "rb")]
+
+
 def test_find_markers(tmp_path):
     fp = tmp_path / "file.py"
     fp.write_text(
@@ -226,3 +258,166 @@ def test_force_update(tmp_path):
     assert updateCalled == []
     sourceFile.maybeUpdateLicense("DUMMY LICENSE", cs, forceUpdate=True)
     assert updateCalled == [True]
+
+
+def test_reads_only_head_of_large_file(tmp_path):
+    fp = tmp_path / "bundle.js"
+    body = "".join("var x%d = %d;\n" % (i, i) for i in range(10000))
+    fp.write_text(
+        "/* begin license *\n *\n * LICENSE\n *\n * end license */\n\n" + body
+    )
+
+    sourceFile = SourceFile(fp, headSize=1024)
+    assert len(sourceFile._head) < 2048
+    assert sourceFile.findMarkerIndexes() == (0, 5)
+
+    cs = CopyrightSet([{"years": [2024], "name": "Seecr", "url": "https://seecr.nl"}])
+    assert sourceFile.maybeUpdateLicense(License("%(copyrightlines)s"), cs) is True
+    assert (
+        fp.read_text()
+        == """\
+/* begin license *
+ *
+ * Copyright (C) 2024 Seecr https://seecr.nl
+ *
+ * end license */
+
+"""
+        + body
+    )
+
+
+def test_license_block_beyond_head_size(tmp_path):
+    fp = tmp_path / "file.py"
+    fp.write_text(
+        "## begin license ##\n#\n"
+        + "# Copyright (C) 2020 Seecr https://seecr.nl\n"
+        + "# some long license text\n" * 200
+        + "#\n## end license ##\n\ndef code(here): pass\n"
+    )
+    sourceFile = SourceFile(fp, headSize=256)
+    assert sourceFile.findMarkerIndexes() == (0, 205)
+    assert sourceFile._parseCopyrightLines() == [
+        {"name": "Seecr", "years": {2020}, "url": "https://seecr.nl"}
+    ]
+
+
+@pytest.mark.parametrize("withCopyFileRange", [True, False])
+def test_rewrite_copies_tail_in_chunks(tmp_path, monkeypatch, withCopyFileRange):
+    monkeypatch.setattr("seecrlicense.sourcefile.COPY_CHUNK_SIZE", 1000)
+    if not withCopyFileRange:
+        monkeypatch.delattr("os.copy_file_range", raising=False)
+    fp = tmp_path / "dump.sh"
+    body = "".join("echo %d\n" % i for i in range(20000))
+    fp.write_text("#!/bin/sh\n" + body)
+    fp.chmod(0o755)
+
+    sourceFile = SourceFile(fp, headSize=4096)
+    sourceFile._updateLicense(License("LICENSE"), CopyrightSet([]))
+    assert (
+        fp.read_text()
+        == "#!/bin/sh\n## begin license ##\n#\n# LICENSE\n#\n## end license ##\n\n"
+        + body
+    )
+    assert fp.stat().st_mode & 0o777 == 0o755
+
+    sourceFile._updateLicense(License("OTHER"), CopyrightSet([]))
+    assert (
+        fp.read_text()
+        == "#!/bin/sh\n## begin license ##\n#\n# OTHER\n#\n## end license ##\n\n"
+        + body
+    )
+    assert not (tmp_path / "dump.sh.tmp").exists()
+
+
+def test_large_file_is_mapped(tmp_path, monkeypatch):
+    monkeypatch.setattr("seecrlicense.sourcefile.MMAP_THRESHOLD", 4096)
+    fp = tmp_path / "bundle.js"
+    body = "".join("var x%d = %d;\n" % (i, i) for i in range(10000))
+    fp.write_text(
+        "/* begin license *\n *\n * Copyright (C) 2020 Seecr https://seecr.nl\n"
+        + " * some long license text\n" * 100
+        + " *\n * end license */\n\n"
+        + body
+    )
+
+    sourceFile = SourceFile(fp, headSize=1024)
+    assert sourceFile._map is not None
+    assert sourceFile.findMarkerIndexes() == (0, 105)
+    region = sourceFile.licenseRegion()
+    assert region.obj is sourceFile._map
+    assert bytes(region[:19]) == b"/* begin license *\n"
+    assert bytes(region[-18:]) == b" * end license */\n"
+    assert sourceFile._parseCopyrightLines() == [
+        {"name": "Seecr", "years": {2020}, "url": "https://seecr.nl"}
+    ]
+    with pytest.raises(BufferError):
+        sourceFile.close()
+    region.release()
+
+    cs = CopyrightSet([{"years": [2024], "name": "Seecr", "url": "https://seecr.nl"}])
+    assert sourceFile.maybeUpdateLicense(License("%(copyrightlines)s"), cs) is True
+    assert sourceFile._map is None
+    assert fp.read_text() == (
+        "/* begin license *\n *\n"
+        " * Copyright (C) 2020, 2024 Seecr https://seecr.nl\n"
+        " *\n * end license */\n\n" + body
+    )
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_license_block_after_code_beyond_head(tmp_path, monkeypatch, mapped):
+    if mapped:
+        monkeypatch.setattr("seecrlicense.sourcefile.MMAP_THRESHOLD", 4096)
+    fp = tmp_path / "late.py"
+    code = "x = 1\n" * 12000
+    fp.write_text(
+        code
+        + "## begin license ##\n#\n# Copyright (C) 2020 Seecr https://seecr.nl\n#\n"
+        + "## end license ##\n"
+    )
+
+    sourceFile = SourceFile(fp)
+    assert sourceFile.hasLicense()
+    assert sourceFile.findMarkerIndexes() == (12000, 12005)
+    cs = CopyrightSet([{"years": [2024], "name": "Seecr", "url": "https://seecr.nl"}])
+    assert sourceFile.maybeUpdateLicense(License("%(copyrightlines)s"), cs) is True
+    assert fp.read_text().count("## begin license ##") == 1
+    assert "# Copyright (C) 2020, 2024 Seecr https://seecr.nl\n" in fp.read_text()
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_end_marker_beyond_head_is_an_error(tmp_path, monkeypatch, mapped):
+    if mapped:
+        monkeypatch.setattr("seecrlicense.sourcefile.MMAP_THRESHOLD", 4096)
+    fp = tmp_path / "broken.py"
+    fp.write_text("x = 1\n" * 12000 + "## end license ##\n")
+
+    sourceFile = SourceFile(fp)
+    with pytest.raises(RuntimeError, match="'end license' marker found without"):
+        sourceFile.findMarkerIndexes()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"## begin license ##\r\n#\r\n# OLD\r\n#\r\n## end license ##\r\n\r\nx = 1\r\n",
+        b"y = 2\r\nx = 1\r\n",
+        b"#!/usr/bin/env python\r\n\r\nx = 1\r\n",
+    ],
+)
+def test_crlf_line_endings_are_kept(content):
+    sourceFile = SourceFile("dos.py", data=content)
+    newContent = sourceFile.licensedHead(License("LICENSE"), CopyrightSet([]))
+    block = b"## begin license ##\r\n#\r\n# LICENSE\r\n#\r\n## end license ##\r\n\r\n"
+    assert block in newContent
+    assert newContent.count(b"\n") == newContent.count(b"\r\n")
+    assert newContent.endswith(b"x = 1\r\n")
+
+
+def test_lf_line_endings_are_kept():
+    sourceFile = SourceFile("unix.py", data=b"x = 1\n")
+    newContent = sourceFile.licensedHead(License("LICENSE"), CopyrightSet([]))
+    assert newContent == (
+        b"## begin license ##\n#\n# LICENSE\n#\n## end license ##\n\nx = 1\n"
+    )
@@ -20,21 +20,112 @@
 #
 ## end license ##
 
+from os import fsdecode
 from os.path import join
-from subprocess import Popen, PIPE
-
-
-def git_status(fullPath=False):
-    with Popen(["git", "status", "--porcelain"], stdout=PIPE, stderr=PIPE) as proc:
-        stdout, stderr = proc.communicate()
-        changes = {}
-        _project_root = project_root()
-        filename_fixup = lambda fn: join(_project_root, fn) if fullPath else fn
-
-        for k, v in (
-            (line[:2], line[2:].strip())
-            for line in stdout.decode(sys.stdout.encoding).split("\n")
-            if line
-        ):
-            changes.setdefault(k, []).append(filename_fixup(v))
-        return changes
+
+
+def _git(args, cwd=None, input=None, env=None):
+    from subprocess import Popen, PIPE
+
+    with Popen(
+        ["git", *args],
+        cwd=cwd,
+        env=env,
+        stdin=None if input is None else PIPE,
+        stdout=PIPE,
+        stderr=PIPE,
+    ) as proc:
+        stdout, stderr = proc.communicate(input)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            "'git %s' failed: %s" % (" ".join(args), fsdecode(stderr).strip())
+        )
+    return stdout
+
+
+def git_ls_files(path, untracked=False):
+    args = ["ls-files", "-z", "--cached"]
+    if untracked:
+        args += ["--others", "--exclude-standard"]
+    return [join(path, fsdecode(fn)) for fn in _git(args, cwd=path).split(b"\0") if fn]
+
+
+def git_toplevel(cwd=None):
+    return fsdecode(_git(["rev-parse", "--show-toplevel"], cwd=cwd)).strip()
+
+
+def git_status(fullPath=False, cwd=None):
+    stdout = _git(["status", "--porcelain", "-z", "--untracked-files=all"], cwd=cwd)
+    root = git_toplevel(cwd)
+    filename_fixup = lambda fn: join(root, fn) if fullPath else fn
+
+    changes = {}
+    entries = iter(stdout.split(b"\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        status = fsdecode(entry[:2])
+        if "R" in status or "C" in status:
+            next(entries)  # the name it was renamed or copied from
+        changes.setdefault(status, []).append(filename_fixup(fsdecode(entry[3:])))
+    return changes
+
+
+def git_changed_files(since=None, cwd=None):
+    """Full paths of files that are added, modified, renamed or untracked in
+    the working tree and, if since is given, changed in since...HEAD."""
+    root = git_toplevel(cwd)
+    changed = set(
+        filename
+        for status, filenames in git_status(fullPath=True, cwd=cwd).items()
+        if "D" not in status
+        for filename in filenames
+    )
+    if since is not None:
+        stdout = _git(
+            ["diff", "--name-only", "-z", "--diff-filter=d", since + "...HEAD"],
+            cwd=cwd,
+        )
+        changed.update(join(root, fsdecode(fn)) for fn in stdout.split(b"\0") if fn)
+    return sorted(changed)
+
+
+def git_history_years(cwd=None, rev=None):
+    """Maps the full path of every file in the history of HEAD, or of rev, to
+    the set of years of the commits that touched it, using a single 'git log'
+    pass. Renames are followed, so the years from before a file was renamed
+    count for its new name."""
+    root = git_toplevel(cwd)
+    stdout = _git(
+        [
+            "log",
+            "--name-status",
+            "-M",
+            "-z",
+            "--format=%x01%ad",
+            "--date=format:%Y",
+        ]
+        + ([rev, "--"] if rev else []),
+        cwd=cwd,
+    )
+    years = {}
+    renamedTo = {}
+    year = None
+    tokens = iter(stdout.split(b"\0"))
+    for token in tokens:
+        if token.startswith(b"\x01"):
+            year = int(token[1:])
+            continue
+        status = token.lstrip(b"\n")
+        if not status:
+            continue
+        filename = fsdecode(next(tokens))
+        if status[:1] in (b"R", b"C"):
+            newFilename = fsdecode(next(tokens))
+            current = renamedTo.get(newFilename, newFilename)
+            if status[:1] == b"R":
+                renamedTo[filename] = current
+            filename = newFilename
+        filename = renamedTo.get(filename, filename)
+        years.setdefault(join(root, filename), set()).add(year)
+    return years
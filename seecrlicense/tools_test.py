@@ -0,0 +1,150 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import environ
+from subprocess import run
+
+import pytest
+
+from .tools import git_status, git_changed_files, git_ls_files, git_history_years
+
+
+def git(repo, *args, env=None):
+    run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.org", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        env=env,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    for name in ["modified.py", "removed.py", "renamed.py", "committed.py"]:
+        (repo / name).write_text("# %s\n" % name)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    return repo
+
+
+def test_git_status(repo):
+    (repo / "modified.py").write_text("# changed\n")
+    (repo / "removed.py").unlink()
+    git(repo, "mv", "renamed.py", "moved.py")
+    (repo / "sub").mkdir()
+    (repo / "sub" / "new.py").write_text("# new\n")
+
+    assert git_status(cwd=repo) == {
+        " M": ["modified.py"],
+        " D": ["removed.py"],
+        "R ": ["moved.py"],
+        "??": ["sub/new.py"],
+    }
+    assert git_status(fullPath=True, cwd=repo / "sub")["??"] == [
+        (repo / "sub" / "new.py").as_posix()
+    ]
+
+
+def test_git_changed_files(repo):
+    git(repo, "checkout", "-q", "-b", "feature")
+    (repo / "committed.py").write_text("# changed\n")
+    (repo / "added.py").write_text("# added\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "feature")
+    (repo / "modified.py").write_text("# changed\n")
+    (repo / "removed.py").unlink()
+
+    assert git_changed_files(cwd=repo) == [(repo / "modified.py").as_posix()]
+    assert git_changed_files(since="main", cwd=repo) == [
+        (repo / name).as_posix() for name in ["added.py", "committed.py", "modified.py"]
+    ]
+
+
+def test_git_ls_files(repo):
+    (repo / "untracked.py").write_text("")
+    assert git_ls_files(repo.as_posix()) == [
+        (repo / name).as_posix()
+        for name in ["committed.py", "modified.py", "removed.py", "renamed.py"]
+    ]
+    assert (repo / "untracked.py").as_posix() in git_ls_files(
+        repo.as_posix(), untracked=True
+    )
+
+
+def test_git_failure(tmp_path):
+    with pytest.raises(RuntimeError) as e:
+        git_status(cwd=tmp_path)
+    assert "'git status --porcelain -z --untracked-files=all' failed" in str(e.value)
+
+
+def test_git_history_years(repo):
+    for year, names in [(2019, ["a.py", "b c.py"]), (2021, ["a.py", "2021"])]:
+        for name in names:
+            (repo / name).write_text("%s\n" % year)
+        git(repo, "add", ".")
+        git(
+            repo,
+            "commit",
+            "-q",
+            "-m",
+            str(year),
+            env=dict(environ, GIT_AUTHOR_DATE="%s-06-01T12:00:00" % year),
+        )
+
+    years = git_history_years(cwd=repo)
+    assert years[(repo / "a.py").as_posix()] == {2019, 2021}
+    assert years[(repo / "b c.py").as_posix()] == {2019}
+    assert years[(repo / "2021").as_posix()] == {2021}
+    assert len(years[(repo / "modified.py").as_posix()]) == 1
+
+
+def test_git_history_years_follows_renames(repo):
+    (repo / "src" / "sub").mkdir(parents=True)
+    for year, change in [
+        (2019, lambda: (repo / "old.py").write_text("# some code\n" * 10)),
+        (2021, lambda: (repo / "old.py").write_text("# some code\n" * 11)),
+        (2023, lambda: git(repo, "mv", "old.py", "src/middle.py")),
+        (2024, lambda: git(repo, "mv", "src/middle.py", "src/sub/b.py")),
+    ]:
+        change()
+        git(repo, "add", ".")
+        git(
+            repo,
+            "commit",
+            "-q",
+            "-m",
+            str(year),
+            env=dict(environ, GIT_AUTHOR_DATE="%s-06-01T12:00:00" % year),
+        )
+
+    years = git_history_years(cwd=repo)
+    assert years[(repo / "src" / "sub" / "b.py").as_posix()] == {
+        2019,
+        2021,
+        2023,
+        2024,
+    }
+    assert (repo / "old.py").as_posix() not in years
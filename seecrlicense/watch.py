@@ -0,0 +1,297 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import read, close, stat, strerror, walk, fsencode, fsdecode, sep
+from os.path import (
+    join,
+    isfile,
+    isdir,
+    basename,
+    dirname,
+    realpath,
+    relpath,
+    commonpath,
+)
+from select import select
+from struct import unpack_from, calcsize
+from time import sleep, monotonic
+
+from .applylicense import should_skip_dir, DEFAULT_IGNORE_RULES
+from .ignore import PathMatcher
+from .report import UPDATED, INSERTED
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_eventHeader = "iIII"
+_eventHeaderSize = calcsize(_eventHeader)
+
+SETTLE_TIME = 0.1
+POLL_INTERVAL = 1.0
+
+
+class Watcher(object):
+    """Keeps an ApplyLicense with its config and license loaded and applies
+    it to files as they change. Files written by the watcher itself are
+    recognised by their stat and do not trigger another round."""
+
+    def __init__(self, applyLicense, paths, engine="auto"):
+        self._applyLicense = applyLicense
+        self._paths = [str(path) for path in paths]
+        self._engine = createEngine(
+            self._paths, engine, PathFilter(self._paths, applyLicense.matcherFor)
+        )
+        self._written = {}
+        applyLicense.loadHistoryYears()
+
+    def run(self):
+        print("Watching %s" % ", ".join(self._paths))
+        try:
+            while True:
+                self.runOnce()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._engine.close()
+
+    def runOnce(self, timeout=None):
+        changed = [
+            filepath
+            for filepath in self._engine.changes(timeout)
+            if not self._isOwnWrite(filepath)
+        ]
+        if not changed:
+            return []
+        results = [self._applyLicense.processFile(f, False) for f in changed]
+        self._applyLicense.handleResults(results, raiseErrors=False)
+        self._applyLicense.save()
+        if not self._applyLicense.dryRun:
+            for result in results:
+                if result.outcome in (UPDATED, INSERTED):
+                    self._written[result.filepath] = _stamp(result.filepath)
+        return results
+
+    def close(self):
+        self._engine.close()
+
+    def _isOwnWrite(self, filepath):
+        written = self._written.pop(filepath, None)
+        try:
+            return written is not None and written == _stamp(filepath)
+        except OSError:
+            return True
+
+
+def createEngine(paths, engine="auto", pathFilter=None):
+    if engine in ("auto", "inotify"):
+        try:
+            return InotifyEngine(paths, pathFilter)
+        except OSError:
+            if engine == "inotify":
+                raise
+    return PollingEngine(paths, pathFilter=pathFilter)
+
+
+class PathFilter(object):
+    """Decides which directories and files below the watched paths are
+    watched, with the same ignore rules as a run: those of each watched
+    directory, given by matcherFor, and the always skipped directories.
+    Files given as watched paths themselves are always watched."""
+
+    def __init__(self, paths, matcherFor=None):
+        matcherFor = matcherFor or (
+            lambda root: PathMatcher.forRoot(root, DEFAULT_IGNORE_RULES)
+        )
+        self._files = set(realpath(path) for path in paths if isfile(path))
+        self._roots = [
+            (realpath(path), matcherFor(path)) for path in paths if isdir(path)
+        ]
+
+    def skipsDirectory(self, directory, filenames):
+        return should_skip_dir(directory, filenames) or self._excludes(directory, "/")
+
+    def watches(self, filepath):
+        if not isfile(filepath):
+            return False
+        return realpath(filepath) in self._files or not self._excludes(filepath, "")
+
+    def _excludes(self, path, suffix):
+        """Whether every watched directory that contains path excludes it."""
+        path = realpath(path)
+        containing = [
+            (root, matcher)
+            for root, matcher in self._roots
+            if commonpath([root, path]) == root
+        ]
+        return bool(containing) and all(
+            path != root
+            and matcher.excludes(relpath(path, root).replace(sep, "/") + suffix)
+            for root, matcher in containing
+        )
+
+
+class InotifyEngine(object):
+    def __init__(self, paths, pathFilter=None):
+        self._pathFilter = pathFilter or PathFilter(paths)
+        libcPath = find_library("c")
+        libc = CDLL(libcPath, use_errno=True)
+        try:
+            self._addWatch = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify is not available")
+        self._fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(get_errno(), strerror(get_errno()))
+        self._directories = {}
+        self._files = set()
+        for path in paths:
+            if isdir(path):
+                self._watchTree(path)
+            elif isfile(path):
+                self._files.add(join(dirname(path) or ".", basename(path)))
+                self._watchDirectory(dirname(path) or ".")
+
+    def changes(self, timeout=None):
+        changed = []
+        events = self._read(timeout)
+        while events:
+            for directory, recursive, mask, name in events:
+                filepath = join(directory, name)
+                if not recursive and filepath not in self._files:
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.extend(self._watchTree(filepath))
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and filepath not in changed:
+                    changed.append(filepath)
+            events = self._read(SETTLE_TIME)
+        return [filepath for filepath in changed if self._pathFilter.watches(filepath)]
+
+    def close(self):
+        if self._fd >= 0:
+            close(self._fd)
+            self._fd = -1
+
+    def _watchTree(self, root):
+        files = []
+        for curdir, subdirs, filenames in walk(root):
+            if self._pathFilter.skipsDirectory(curdir, filenames):
+                del subdirs[:]
+                continue
+            self._watchDirectory(curdir, recursive=True)
+            files.extend(join(curdir, filename) for filename in filenames)
+        return files
+
+    def _watchDirectory(self, directory, recursive=False):
+        wd = self._addWatch(self._fd, fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return
+        if recursive or self._directories.get(wd, (None, False))[1] is False:
+            self._directories[wd] = directory, recursive
+
+    def _read(self, timeout):
+        readable, _, _ = select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = unpack_from(_eventHeader, data, offset)
+            offset += _eventHeaderSize
+            name = fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+            elif wd in self._directories:
+                directory, recursive = self._directories[wd]
+                events.append((directory, recursive, mask, name))
+        return events
+
+
+class PollingEngine(object):
+    """Fallback that compares mtimes and sizes of all candidate files."""
+
+    def __init__(self, paths, interval=POLL_INTERVAL, pathFilter=None):
+        self._paths = paths
+        self._interval = interval
+        self._pathFilter = pathFilter or PathFilter(paths)
+        self._snapshot = self._takeSnapshot()
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            snapshot = self._takeSnapshot()
+            changed = [
+                filepath
+                for filepath, stamp in snapshot.items()
+                if self._snapshot.get(filepath) != stamp
+            ]
+            self._snapshot = snapshot
+            if changed or (deadline is not None and monotonic() >= deadline):
+                return changed
+            sleep(self._interval)
+
+    def close(self):
+        pass
+
+    def _takeSnapshot(self):
+        snapshot = {}
+        for filepath in _walkFiles(self._paths, self._pathFilter):
+            try:
+                snapshot[filepath] = _stamp(filepath)
+            except OSError:
+                pass
+        return snapshot
+
+
+def _walkFiles(paths, pathFilter):
+    for path in paths:
+        if isfile(path):
+            yield path
+            continue
+        for curdir, subdirs, filenames in walk(path):
+            if pathFilter.skipsDirectory(curdir, filenames):
+                del subdirs[:]
+                continue
+            for filename in filenames:
+                filepath = join(curdir, filename)
+                if pathFilter.watches(filepath):
+                    yield filepath
+
+
+def _stamp(filepath):
+    st = stat(filepath)
+    return st.st_mtime_ns, st.st_size, st.st_ino
@@ -0,0 +1,124 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import pytest
+
+from .report import INSERTED, ERROR
+from .watch import Watcher, InotifyEngine, PollingEngine
+
+
+@pytest.mark.parametrize("engine", ["poll", "inotify"])
+def test_applies_license_to_changed_files_only(
+    tmp_path, capsys, engine, applyLicense
+):
+    untouched = tmp_path / "untouched.py"
+    untouched.write_text("# untouched")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "hook.py").write_text("# hook")
+    try:
+        watcher = Watcher(applyLicense(), [tmp_path], engine=engine)
+    except OSError:
+        pytest.skip("inotify is not available")
+    if engine == "poll":
+        watcher._engine._interval = 0.01
+    try:
+        assert watcher.runOnce(timeout=0.05) == []
+
+        sourceFile = tmp_path / "sub" / "source.py"
+        sourceFile.parent.mkdir()
+        sourceFile.write_text("# stuff")
+        (tmp_path / ".git" / "hook.py").write_text("# changed hook")
+        (tmp_path / ".source.py.swp").write_text("swap")
+
+        results = watcher.runOnce(timeout=1)
+        assert [(r.filepath, r.outcome) for r in results] == [
+            (str(sourceFile), INSERTED)
+        ]
+        assert "2007 CQ2" in sourceFile.read_text()
+        assert untouched.read_text() == "# untouched"
+
+        assert watcher.runOnce(timeout=0.3) == []
+    finally:
+        watcher.close()
+    assert "Updated %s" % sourceFile in capsys.readouterr().out
+
+
+def test_errors_do_not_stop_watching(tmp_path, capsys, applyLicense):
+    watcher = Watcher(applyLicense(), [tmp_path], engine="poll")
+    watcher._engine._interval = 0.01
+    broken = tmp_path / "broken.py"
+    broken.write_text("## begin license ##\n# no end\n")
+    good = tmp_path / "good.py"
+    good.write_text("# good")
+
+    results = watcher.runOnce(timeout=1)
+
+    assert sorted((r.filepath, r.outcome) for r in results) == [
+        (str(broken), ERROR),
+        (str(good), INSERTED),
+    ]
+    assert "Error in %s" % broken in capsys.readouterr().out
+
+
+def test_engines_watch_explicit_files(tmp_path):
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# stuff")
+    otherFile = tmp_path / "other.py"
+    engines = [PollingEngine([str(sourceFile)], interval=0.01)]
+    try:
+        engines.append(InotifyEngine([str(sourceFile)]))
+    except OSError:
+        pass
+
+    otherFile.write_text("# other")
+    sourceFile.write_text("# changed")
+
+    for engine in engines:
+        assert engine.changes(timeout=1) == [str(sourceFile)]
+        engine.close()
+
+
+@pytest.mark.parametrize("engine", ["poll", "inotify"])
+def test_ignore_rules_apply_to_watched_trees(tmp_path, engine, applyLicense):
+    (tmp_path / ".licenseignore").write_text("vendor/\n")
+    (tmp_path / "vendor").mkdir()
+    try:
+        watcher = Watcher(applyLicense(exclude=["*.sh"]), [tmp_path], engine=engine)
+    except OSError:
+        pytest.skip("inotify is not available")
+    if engine == "poll":
+        watcher._engine._interval = 0.01
+    try:
+        (tmp_path / "vendor" / "lib.py").write_text("# vendored")
+        (tmp_path / "new").mkdir()
+        (tmp_path / "new" / "vendor").mkdir()
+        (tmp_path / "new" / "vendor" / "lib.py").write_text("# vendored")
+        (tmp_path / "x.sh").write_text("#!/bin/sh\n")
+        sourceFile = tmp_path / "new" / "source.py"
+        sourceFile.write_text("# stuff")
+
+        results = watcher.runOnce(timeout=1)
+        assert [r.filepath for r in results] == [str(sourceFile)]
+        assert (tmp_path / "vendor" / "lib.py").read_text() == "# vendored"
+        assert (tmp_path / "x.sh").read_text() == "#!/bin/sh\n"
+    finally:
+        watcher.close()
@@ -0,0 +1,73 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from os import open as osOpen, close, fsync, rename, O_RDONLY
+from os.path import abspath, dirname
+from time import perf_counter
+
+FAST = "fast"
+DURABLE = "durable"
+STAGED = "staged"
+WRITE_STRATEGIES = (FAST, DURABLE, STAGED)
+
+
+class WriteBatch(object):
+    """Completes the writes of a batch of results in the main process.
+
+    With the fast and durable strategies files are already renamed into
+    place by whoever processed them; durable files were fsynced before the
+    rename and here every directory written to is fsynced once. With the
+    staged strategy only the temporary files were written, and they are
+    renamed in bulk here."""
+
+    def __init__(self, strategy=FAST):
+        self.strategy = strategy
+        self.files = 0
+        self.seconds = 0.0
+        self._staged = []
+        self._directories = set()
+
+    def add(self, result):
+        self.files += 1
+        self.seconds += result.timings.get("write", 0.0)
+        if result.staged is not None:
+            self._staged.append((result.staged, result.filepath))
+        if self.strategy == DURABLE:
+            self._directories.add(dirname(abspath(result.filepath)))
+
+    def finish(self):
+        t0 = perf_counter()
+        staged, self._staged = self._staged, []
+        for tmpFileName, filepath in staged:
+            rename(tmpFileName, filepath)
+        directories, self._directories = self._directories, set()
+        for directory in sorted(directories):
+            fsyncDirectory(directory)
+        self.seconds += perf_counter() - t0
+
+
+def fsyncDirectory(directory):
+    fd = osOpen(directory, O_RDONLY)
+    try:
+        fsync(fd)
+    finally:
+        close(fd)
@@ -0,0 +1,54 @@
+## begin license ##
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Seecr License"
+#
+# "Seecr License" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Seecr License" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Seecr License"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from . import writer
+from .report import FileResult
+from .sourcefile import SourceFile
+from .writer import WriteBatch, STAGED, DURABLE
+
+
+def test_staged_files_are_renamed_on_finish(tmp_path):
+    sourceFile = tmp_path / "source.py"
+    sourceFile.write_text("# old\n")
+    result = FileResult(str(sourceFile), False)
+    result.staged = SourceFile(str(sourceFile))._writeTemp(b"# new\n")
+    batch = WriteBatch(STAGED)
+
+    batch.add(result)
+    assert sourceFile.read_text() == "# old\n"
+    batch.finish()
+
+    assert sourceFile.read_text() == "# new\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["source.py"]
+    assert batch.files == 1
+
+
+def test_durable_flushes_each_directory_once(tmp_path, monkeypatch):
+    flushed = []
+    monkeypatch.setattr(writer, "fsyncDirectory", flushed.append)
+    batch = WriteBatch(DURABLE)
+    for name in ["a/one.py", "a/two.py", "b/three.py"]:
+        batch.add(FileResult(str(tmp_path / name), False))
+
+    batch.finish()
+
+    assert flushed == [str(tmp_path / "a"), str(tmp_path / "b")]